@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
-import time
 import threading
 import cursor
 import curses
@@ -21,6 +20,7 @@ class AGETICUI:
         init(autoreset=True)
         self._loading_active = False
         self._loading_thread: Optional[threading.Thread] = None
+        self._loading_stop = threading.Event()
         self._stdscr = None
         self._using_log_window = False
         
@@ -55,9 +55,10 @@ class AGETICUI:
             return
 
         self._loading_active = True
+        self._loading_stop = threading.Event()
         self._loading_thread = threading.Thread(
             target=self._animate_loading,
-            args=(message,)
+            args=(message, self._loading_stop)
         )
         self._loading_thread.daemon = True
         
@@ -74,6 +75,7 @@ class AGETICUI:
     def stop_loading_animation(self):
         """Stop loading animation."""
         self._loading_active = False
+        self._loading_stop.set()
         if self._loading_thread:
             self._loading_thread.join()
             
@@ -90,10 +92,15 @@ class AGETICUI:
             sys.stdout.write('\r' + ' ' * 80 + '\r')
             sys.stdout.flush()
 
-    def _animate_loading(self, message: str):
-        """Animate loading indicator."""
+    def _animate_loading(self, message: str, stop: threading.Event):
+        """Animate loading indicator.
+        
+        Args:
+            message: Message shown next to the spinner
+            stop: Set to end the animation
+        """
         frame_idx = 0
-        while self._loading_active:
+        while not stop.is_set():
             frame = self.symbols['loading'][frame_idx]
             frame_idx = (frame_idx + 1) % len(self.symbols['loading'])
             
@@ -128,7 +135,9 @@ class AGETICUI:
                 sys.stdout.write(f'\r{Fore.CYAN}{frame} {message}')
                 sys.stdout.flush()
                 
-            time.sleep(0.1)
+            # Waiting on the event instead of sleeping lets the stop return
+            # at once rather than after the rest of the frame
+            stop.wait(0.1)
 
     def print_success(self, message: str):
         """Print success message."""
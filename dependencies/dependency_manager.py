@@ -1,17 +1,66 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """Dependency manager for handling project dependencies."""
+import io
 import os
 import sys
 import json
+import shutil
+import asyncio
 import subprocess
 import re
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, Set, Union
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple, Set, Union, IO, Callable
+
+# Splits a requirement spec into package name and version constraint
+_REQ_SPLIT = re.compile(r'[<>=!~]')
+
+def _req_line_pattern(package: str) -> 're.Pattern':
+    """Build pattern matching a requirements line for package.
+    
+    Args:
+        package: Package name
+        
+    Returns:
+        re.Pattern: Compiled pattern
+    """
+    return re.compile(rf'^{re.escape(package)}(==|>=|<=|~=|!=|>|<|@|$)')
+
+@dataclass(frozen=True, slots=True)
+class PackageManager:
+    """Operations and dependency file of a single package manager."""
+    name: str
+    detect: Callable[[], bool]
+    install: Callable[[], bool]
+    add: Callable[[str, bool], bool]
+    add_many: Callable[[List[str], bool], bool]
+    remove: Callable[[str], bool]
+    update: Callable[[Optional[str]], bool]
+    list: Callable[[], List[Dict[str, str]]]
+    parse_list: Callable[[IO[str]], List[Dict[str, str]]]
+    file: str
 
 class DependencyManager:
     """Manages project dependencies for different package managers."""
     
+    # Files probed in the project root to detect package managers
+    MARKER_FILES = ('requirements.txt', 'setup.py', 'pyproject.toml', 'package.json', 'yarn.lock')
+    
+    # Package manager executables looked up on PATH
+    BINARIES = ('pip', 'npm', 'yarn', 'poetry')
+    
+    # Commands used to list installed packages for each manager
+    LIST_COMMANDS = {
+        'pip': ['pip', 'list', '--format=json'],
+        'npm': ['npm', 'list', '--json'],
+        'yarn': ['yarn', 'list', '--json'],
+        'poetry': ['poetry', 'show', '--no-ansi']
+    }
+    
+    # Maximum number of concurrent list subprocesses
+    MAX_CONCURRENT_LISTS = 4
+    
     def __init__(self, project_root: Optional[Path] = None):
         """Initialize dependency manager.
         
@@ -19,47 +68,77 @@ class DependencyManager:
             project_root: Optional project root directory
         """
         self.project_root = project_root or Path.cwd()
-        self.package_managers = {
-            'pip': {
-                'detect': self._detect_pip,
-                'install': self._pip_install,
-                'add': self._pip_add,
-                'remove': self._pip_remove,
-                'update': self._pip_update,
-                'list': self._pip_list,
-                'file': 'requirements.txt'
-            },
-            'npm': {
-                'detect': self._detect_npm,
-                'install': self._npm_install,
-                'add': self._npm_add,
-                'remove': self._npm_remove,
-                'update': self._npm_update,
-                'list': self._npm_list,
-                'file': 'package.json'
-            },
-            'yarn': {
-                'detect': self._detect_yarn,
-                'install': self._yarn_install,
-                'add': self._yarn_add,
-                'remove': self._yarn_remove,
-                'update': self._yarn_update,
-                'list': self._yarn_list,
-                'file': 'package.json'
-            },
-            'poetry': {
-                'detect': self._detect_poetry,
-                'install': self._poetry_install,
-                'add': self._poetry_add,
-                'remove': self._poetry_remove,
-                'update': self._poetry_update,
-                'list': self._poetry_list,
-                'file': 'pyproject.toml'
-            }
-        }
+        managers = (
+            PackageManager(
+                name='pip',
+                detect=self._detect_pip,
+                install=self._pip_install,
+                add=self._pip_add,
+                add_many=self._pip_add_many,
+                remove=self._pip_remove,
+                update=self._pip_update,
+                list=self._pip_list,
+                parse_list=self._parse_pip_list,
+                file='requirements.txt'
+            ),
+            PackageManager(
+                name='npm',
+                detect=self._detect_npm,
+                install=self._npm_install,
+                add=self._npm_add,
+                add_many=self._npm_add_many,
+                remove=self._npm_remove,
+                update=self._npm_update,
+                list=self._npm_list,
+                parse_list=self._parse_npm_list,
+                file='package.json'
+            ),
+            PackageManager(
+                name='yarn',
+                detect=self._detect_yarn,
+                install=self._yarn_install,
+                add=self._yarn_add,
+                add_many=self._yarn_add_many,
+                remove=self._yarn_remove,
+                update=self._yarn_update,
+                list=self._yarn_list,
+                parse_list=self._parse_yarn_list,
+                file='package.json'
+            ),
+            PackageManager(
+                name='poetry',
+                detect=self._detect_poetry,
+                install=self._poetry_install,
+                add=self._poetry_add,
+                add_many=self._poetry_add_many,
+                remove=self._poetry_remove,
+                update=self._poetry_update,
+                list=self._poetry_list,
+                parse_list=self._parse_poetry_list,
+                file='pyproject.toml'
+            )
+        )
+        self.package_managers: Dict[str, PackageManager] = {pm.name: pm for pm in managers}
+        
+        # List the project root once; detectors consult this set of marker files
+        try:
+            with os.scandir(self.project_root) as entries:
+                self._present = frozenset(
+                    entry.name for entry in entries if entry.name in self.MARKER_FILES
+                )
+        except OSError:
+            self._present = frozenset()
+        self._has_poetry: Optional[bool] = None
+        
+        # Resolve package manager executables once
+        self._bins = {name: shutil.which(name) for name in self.BINARIES}
+        self._base_requirements_cache: Optional[Tuple[int, List[str]]] = None
         
         # Detect available package managers
         self.available_managers = self._detect_package_managers()
+        self._available: Tuple[PackageManager, ...] = tuple(
+            pm for pm in self.package_managers.values() if self.available_managers[pm.name]
+        )
         
         # Load base requirements
         self.base_requirements = self.load_base_requirements()
@@ -73,7 +152,7 @@ class DependencyManager:
         available = {}
         
         for name, manager in self.package_managers.items():
-            available[name] = manager['detect']()
+            available[name] = manager.detect()
             
         return available
     
@@ -83,19 +162,11 @@ class DependencyManager:
         Returns:
             bool: True if pip is available
         """
-        # Check for requirements.txt
-        if (self.project_root / 'requirements.txt').exists():
-            return True
-            
-        # Check for setup.py
-        if (self.project_root / 'setup.py').exists():
-            return True
-            
-        # Check for pyproject.toml
-        if (self.project_root / 'pyproject.toml').exists():
-            return True
+        if not self._bins['pip']:
+            return False
             
-        return False
+        # Check for requirements.txt, setup.py or pyproject.toml
+        return bool(self._present & {'requirements.txt', 'setup.py', 'pyproject.toml'})
     
     def _detect_npm(self) -> bool:
         """Detect if npm is available.
@@ -103,15 +174,11 @@ class DependencyManager:
         Returns:
             bool: True if npm is available
         """
-        # Check for package.json
-        if (self.project_root / 'package.json').exists():
-            # Check if yarn.lock exists (prefer yarn if it does)
-            if (self.project_root / 'yarn.lock').exists():
-                return False
-                
-            return True
+        if not self._bins['npm']:
+            return False
             
-        return False
+        # Check for package.json (prefer yarn if yarn.lock exists)
+        return 'package.json' in self._present and 'yarn.lock' not in self._present
     
     def _detect_yarn(self) -> bool:
         """Detect if yarn is available.
@@ -119,11 +186,11 @@ class DependencyManager:
         Returns:
             bool: True if yarn is available
         """
-        # Check for package.json and yarn.lock
-        if (self.project_root / 'package.json').exists() and (self.project_root / 'yarn.lock').exists():
-            return True
+        if not self._bins['yarn']:
+            return False
             
-        return False
+        # Check for package.json and yarn.lock
+        return 'package.json' in self._present and 'yarn.lock' in self._present
     
     def _detect_poetry(self) -> bool:
         """Detect if poetry is available.
@@ -131,18 +198,30 @@ class DependencyManager:
         Returns:
             bool: True if poetry is available
         """
+        if self._has_poetry is not None:
+            return self._has_poetry
+            
         # Check for pyproject.toml with poetry section
-        pyproject_path = self.project_root / 'pyproject.toml'
-        if pyproject_path.exists():
+        self._has_poetry = False
+        if self._bins['poetry'] and 'pyproject.toml' in self._present:
             try:
-                with open(pyproject_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if '[tool.poetry]' in content:
-                        return True
+                with open(self.project_root / 'pyproject.toml', 'r', encoding='utf-8') as f:
+                    self._has_poetry = '[tool.poetry]' in f.read()
             except:
                 pass
                 
-        return False
+        return self._has_poetry
+    
+    def _is_missing_binary(self, command: List[str]) -> bool:
+        """Check whether command targets a package manager missing from PATH.
+        
+        Args:
+            command: Command to check
+            
+        Returns:
+            bool: True if the executable is known to be missing
+        """
+        return command[0] in self._bins and not self._bins[command[0]]
     
     def _run_command(self, command: List[str], cwd: Optional[Path] = None) -> Tuple[int, str, str]:
         """Run command and return output.
@@ -154,21 +233,96 @@ class DependencyManager:
         Returns:
             Tuple[int, str, str]: Tuple of (exit_code, stdout, stderr)
         """
+        if self._is_missing_binary(command):
+            return 127, '', f'{command[0]}: command not found'
+            
         try:
-            process = subprocess.Popen(
+            result = subprocess.run(
                 command,
                 cwd=str(cwd or self.project_root),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                capture_output=True,
+                text=True,
+                check=False
             )
+            return result.returncode, result.stdout, result.stderr
             
-            stdout, stderr = process.communicate()
-            return process.returncode, stdout, stderr
+        except Exception as e:
+            return 1, '', str(e)
+    
+    async def _run_command_async(self, command: List[str], cwd: Optional[Path] = None) -> Tuple[int, str, str]:
+        """Run command asynchronously and return output.
+        
+        Args:
+            command: Command to run
+            cwd: Working directory
+            
+        Returns:
+            Tuple[int, str, str]: Tuple of (exit_code, stdout, stderr)
+        """
+        if self._is_missing_binary(command):
+            return 127, '', f'{command[0]}: command not found'
+            
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=str(cwd or self.project_root),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            
+            stdout, stderr = await process.communicate()
+            return (
+                process.returncode,
+                stdout.decode('utf-8', errors='replace'),
+                stderr.decode('utf-8', errors='replace')
+            )
             
         except Exception as e:
             return 1, '', str(e)
     
+    def _run_command_streaming(self, command: List[str], cwd: Optional[Path] = None) -> Optional[subprocess.Popen]:
+        """Start command with its stdout exposed as a text stream.
+        
+        Args:
+            command: Command to run
+            cwd: Working directory
+            
+        Returns:
+            Optional[subprocess.Popen]: Running process, or None if it could not be started
+        """
+        if self._is_missing_binary(command):
+            return None
+            
+        try:
+            return subprocess.Popen(
+                command,
+                cwd=str(cwd or self.project_root),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        except Exception:
+            return None
+    
+    def _list_streaming(self, name: str) -> List[Dict[str, str]]:
+        """List installed packages, parsing output as it is produced.
+        
+        Args:
+            name: Package manager name
+            
+        Returns:
+            List[Dict[str, str]]: List of package information
+        """
+        process = self._run_command_streaming(self.LIST_COMMANDS[name])
+        if process is None:
+            return []
+            
+        # Closing the pipe on exit also stops a child we stopped reading from
+        with process:
+            packages = self.package_managers[name].parse_list(process.stdout)
+            
+        return packages if process.returncode == 0 else []
+    
     def _pip_install(self) -> bool:
         """Install pip dependencies.
         
@@ -202,29 +356,60 @@ class DependencyManager:
         Returns:
             bool: True if package was added successfully
         """
-        # Install package
-        command = ['pip', 'install']
-        if dev:
-            # There's no standard way to mark dev dependencies with pip
-            # We'll add it to requirements-dev.txt if it exists
-            command.append(package)
-            exit_code, _, _ = self._run_command(command)
-            
-            if exit_code == 0 and (self.project_root / 'requirements-dev.txt').exists():
-                # Add to requirements-dev.txt
-                with open(self.project_root / 'requirements-dev.txt', 'a') as f:
-                    f.write(f'\n{package}\n')
-        else:
-            command.append(package)
-            exit_code, _, _ = self._run_command(command)
+        return self._pip_add_many([package], dev)
+    
+    def _pip_add_many(self, packages: List[str], dev: bool = False) -> bool:
+        """Add several pip dependencies with a single install.
+        
+        Args:
+            packages: Packages to add
+            dev: Whether to add as dev dependencies
+            
+        Returns:
+            bool: True if packages were added successfully
+        """
+        exit_code, _, _ = self._run_command(['pip', 'install', *packages])
+        
+        # There's no standard way to mark dev dependencies with pip
+        # We'll add them to requirements-dev.txt if it exists
+        req_file = self.project_root / ('requirements-dev.txt' if dev else 'requirements.txt')
+        if exit_code == 0 and req_file.exists():
+            self._append_to_requirements(req_file, packages)
             
-            if exit_code == 0 and (self.project_root / 'requirements.txt').exists():
-                # Add to requirements.txt
-                with open(self.project_root / 'requirements.txt', 'a') as f:
-                    f.write(f'\n{package}\n')
-                    
         return exit_code == 0
     
+    def _append_to_requirements(self, file_path: Path, packages: List[str]):
+        """Append packages not already listed to requirements file.
+        
+        Args:
+            file_path: Path to requirements file
+            packages: Packages to append
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                
+            # Skip packages that are already listed
+            existing = [
+                line.strip() for line in content.splitlines()
+                if line.strip() and not line.strip().startswith('#')
+            ]
+            listed = {_REQ_SPLIT.split(req, 1)[0].strip() for req in existing}
+            added = [
+                req for req in self.merge_requirements(existing, packages)
+                if _REQ_SPLIT.split(req, 1)[0].strip() not in listed
+            ]
+            if not added:
+                return
+                
+            if content and not content.endswith('\n'):
+                content += '\n'
+                
+            self._write_file_atomic(file_path, content + '\n'.join(added) + '\n')
+                
+        except Exception:
+            pass
+    
     def _pip_remove(self, package: str) -> bool:
         """Remove pip dependency.
         
@@ -256,15 +441,18 @@ class DependencyManager:
             package: Package to remove
         """
         try:
-            with open(file_path, 'r') as f:
+            with open(file_path, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
                 
             # Remove package lines
-            package_pattern = re.compile(rf'^{re.escape(package)}(==|>=|<=|~=|!=|>|<|@|$)')
-            lines = [line for line in lines if not package_pattern.match(line.strip())]
+            # Only lines starting with the package name need the regex check
+            package_pattern = _req_line_pattern(package)
+            lines = [
+                line for line in lines
+                if not (line.lstrip().startswith(package) and package_pattern.match(line.strip()))
+            ]
             
-            with open(file_path, 'w') as f:
-                f.writelines(lines)
+            self._write_file_atomic(file_path, ''.join(lines))
                 
         except Exception:
             pass
@@ -296,22 +484,27 @@ class DependencyManager:
         Returns:
             List[Dict[str, str]]: List of package information
         """
-        exit_code, stdout, _ = self._run_command(['pip', 'list', '--format=json'])
+        return self._list_streaming('pip')
+    
+    def _parse_pip_list(self, stream: IO[str]) -> List[Dict[str, str]]:
+        """Parse `pip list --format=json` output.
         
-        if exit_code == 0:
-            try:
-                packages = json.loads(stdout)
-                return [
-                    {
-                        'name': pkg['name'],
-                        'version': pkg['version'],
-                        'type': 'regular'
-                    }
-                    for pkg in packages
-                ]
-            except:
-                pass
-                
+        Args:
+            stream: Command output stream
+            
+        Returns:
+            List[Dict[str, str]]: List of package information
+        """
+        try:
+            # Build the result dicts during decoding instead of copying afterwards
+            return json.load(stream, object_hook=lambda pkg: {
+                'name': pkg['name'],
+                'version': pkg['version'],
+                'type': 'regular'
+            })
+        except:
+            pass
+            
         return []
     
     def _npm_install(self) -> bool:
@@ -333,13 +526,25 @@ class DependencyManager:
         Returns:
             bool: True if package was added successfully
         """
+        return self._npm_add_many([package], dev)
+    
+    def _npm_add_many(self, packages: List[str], dev: bool = False) -> bool:
+        """Add several npm dependencies with a single command.
+        
+        Args:
+            packages: Packages to add
+            dev: Whether to add as dev dependencies
+            
+        Returns:
+            bool: True if packages were added successfully
+        """
         command = ['npm', 'install']
         if dev:
             command.append('--save-dev')
         else:
             command.append('--save')
             
-        command.append(package)
+        command.extend(packages)
         exit_code, _, _ = self._run_command(command)
         return exit_code == 0
     
@@ -377,35 +582,34 @@ class DependencyManager:
         Returns:
             List[Dict[str, str]]: List of package information
         """
-        exit_code, stdout, _ = self._run_command(['npm', 'list', '--json'])
+        return self._list_streaming('npm')
+    
+    def _parse_npm_list(self, stream: IO[str]) -> List[Dict[str, str]]:
+        """Parse `npm list --json` output.
+        
+        Args:
+            stream: Command output stream
+            
+        Returns:
+            List[Dict[str, str]]: List of package information
+        """
+        try:
+            data = json.load(stream)
+            packages = []
+            
+            # Get regular and dev dependencies in a single pass
+            for section, dep_type in (('dependencies', 'regular'), ('devDependencies', 'dev')):
+                for name, info in data.get(section, {}).items():
+                    packages.append({
+                        'name': name,
+                        'version': info.get('version', ''),
+                        'type': dep_type
+                    })
+                    
+            return packages
+        except:
+            pass
         
-        if exit_code == 0:
-            try:
-                data = json.loads(stdout)
-                packages = []
-                
-                # Get regular dependencies
-                if 'dependencies' in data:
-                    for name, info in data['dependencies'].items():
-                        packages.append({
-                            'name': name,
-                            'version': info.get('version', ''),
-                            'type': 'regular'
-                        })
-                        
-                # Get dev dependencies
-                if 'devDependencies' in data:
-                    for name, info in data['devDependencies'].items():
-                        packages.append({
-                            'name': name,
-                            'version': info.get('version', ''),
-                            'type': 'dev'
-                        })
-                        
-                return packages
-            except:
-                pass
-                
         return []
     
     def _yarn_install(self) -> bool:
@@ -427,11 +631,23 @@ class DependencyManager:
         Returns:
             bool: True if package was added successfully
         """
+        return self._yarn_add_many([package], dev)
+    
+    def _yarn_add_many(self, packages: List[str], dev: bool = False) -> bool:
+        """Add several yarn dependencies with a single command.
+        
+        Args:
+            packages: Packages to add
+            dev: Whether to add as dev dependencies
+            
+        Returns:
+            bool: True if packages were added successfully
+        """
         command = ['yarn', 'add']
         if dev:
             command.append('--dev')
             
-        command.append(package)
+        command.extend(packages)
         exit_code, _, _ = self._run_command(command)
         return exit_code == 0
     
@@ -469,33 +685,41 @@ class DependencyManager:
         Returns:
             List[Dict[str, str]]: List of package information
         """
-        exit_code, stdout, _ = self._run_command(['yarn', 'list', '--json'])
+        return self._list_streaming('yarn')
+    
+    def _parse_yarn_list(self, stream: IO[str]) -> List[Dict[str, str]]:
+        """Parse `yarn list --json` output.
+        
+        Args:
+            stream: Command output stream
+            
+        Returns:
+            List[Dict[str, str]]: List of package information
+        """
+        try:
+            data = json.load(stream)
+            packages = []
+            
+            if 'data' in data and 'trees' in data['data']:
+                for item in data['data']['trees']:
+                    name = item.get('name', '')
+                    if name:
+                        # Extract name and version
+                        parts = name.split('@')
+                        if len(parts) > 1:
+                            pkg_name = '@'.join(parts[:-1]) if name.startswith('@') else parts[0]
+                            version = parts[-1]
+                            
+                            packages.append({
+                                'name': pkg_name,
+                                'version': version,
+                                'type': 'regular'  # Yarn doesn't distinguish in list output
+                            })
+                            
+            return packages
+        except:
+            pass
         
-        if exit_code == 0:
-            try:
-                data = json.loads(stdout)
-                packages = []
-                
-                if 'data' in data and 'trees' in data['data']:
-                    for item in data['data']['trees']:
-                        name = item.get('name', '')
-                        if name:
-                            # Extract name and version
-                            parts = name.split('@')
-                            if len(parts) > 1:
-                                pkg_name = '@'.join(parts[:-1]) if name.startswith('@') else parts[0]
-                                version = parts[-1]
-                                
-                                packages.append({
-                                    'name': pkg_name,
-                                    'version': version,
-                                    'type': 'regular'  # Yarn doesn't distinguish in list output
-                                })
-                                
-                return packages
-            except:
-                pass
-                
         return []
     
     def _poetry_install(self) -> bool:
@@ -517,11 +741,23 @@ class DependencyManager:
         Returns:
             bool: True if package was added successfully
         """
+        return self._poetry_add_many([package], dev)
+    
+    def _poetry_add_many(self, packages: List[str], dev: bool = False) -> bool:
+        """Add several poetry dependencies with a single command.
+        
+        Args:
+            packages: Packages to add
+            dev: Whether to add as dev dependencies
+            
+        Returns:
+            bool: True if packages were added successfully
+        """
         command = ['poetry', 'add']
         if dev:
             command.append('--dev')
             
-        command.append(package)
+        command.extend(packages)
         exit_code, _, _ = self._run_command(command)
         return exit_code == 0
     
@@ -559,26 +795,76 @@ class DependencyManager:
         Returns:
             List[Dict[str, str]]: List of package information
         """
-        exit_code, stdout, _ = self._run_command(['poetry', 'show', '--no-ansi'])
+        return self._list_streaming('poetry')
+    
+    def _parse_poetry_list(self, stream: IO[str]) -> List[Dict[str, str]]:
+        """Parse `poetry show` output.
         
-        if exit_code == 0:
-            packages = []
+        Args:
+            stream: Command output stream
             
-            for line in stdout.splitlines():
-                if not line.strip():
-                    continue
-                    
-                parts = line.split()
-                if len(parts) >= 2:
-                    packages.append({
-                        'name': parts[0],
-                        'version': parts[1],
-                        'type': 'regular'  # Can't determine from this output
-                    })
-                    
-            return packages
+        Returns:
+            List[Dict[str, str]]: List of package information
+        """
+        packages = []
+        
+        for line in stream:
+            if not line.strip():
+                continue
+                
+            parts = line.split()
+            if len(parts) >= 2:
+                packages.append({
+                    'name': parts[0],
+                    'version': parts[1],
+                    'type': 'regular'  # Can't determine from this output
+                })
+                
+        return packages
+    
+    async def _list_async(self, name: str, semaphore: asyncio.Semaphore) -> List[Dict[str, str]]:
+        """List installed packages for a manager asynchronously.
+        
+        Args:
+            name: Package manager name
+            semaphore: Semaphore bounding concurrent subprocesses
             
-        return []
+        Returns:
+            List[Dict[str, str]]: List of package information
+        """
+        async with semaphore:
+            exit_code, stdout, _ = await self._run_command_async(self.LIST_COMMANDS[name])
+            
+        if exit_code != 0:
+            return []
+            
+        return self.package_managers[name].parse_list(io.StringIO(stdout))
+    
+    async def _list_all_async(self, names: List[str]) -> List[List[Dict[str, str]]]:
+        """List installed packages for several managers concurrently.
+        
+        Args:
+            names: Package manager names
+            
+        Returns:
+            List[List[Dict[str, str]]]: Package lists in the same order as names
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_LISTS)
+        return await asyncio.gather(*(self._list_async(name, semaphore) for name in names))
+    
+    def _get_available_manager(self, manager: Optional[str]) -> Optional[PackageManager]:
+        """Get requested package manager if it is available.
+        
+        Args:
+            manager: Optional package manager name
+            
+        Returns:
+            Optional[PackageManager]: Package manager, or None if not requested or unavailable
+        """
+        if manager and self.available_managers.get(manager):
+            return self.package_managers[manager]
+            
+        return None
     
     def install_dependencies(self) -> bool:
         """Install project dependencies.
@@ -589,12 +875,10 @@ class DependencyManager:
         success = False
         
         # Try each available package manager
-        for name, available in self.available_managers.items():
-            if available:
-                manager = self.package_managers[name]
-                if manager['install']():
-                    success = True
-                    break
+        for manager in self._available:
+            if manager.install():
+                success = True
+                break
                     
         return success
     
@@ -609,15 +893,41 @@ class DependencyManager:
         Returns:
             bool: True if package was added successfully
         """
-        if manager and manager in self.available_managers and self.available_managers[manager]:
+        selected = self._get_available_manager(manager)
+        if selected:
             # Use specified manager
-            return self.package_managers[manager]['add'](package, dev)
+            return selected.add(package, dev)
             
         # Try each available package manager
-        for name, available in self.available_managers.items():
-            if available:
-                if self.package_managers[name]['add'](package, dev):
-                    return True
+        for pm in self._available:
+            if pm.add(package, dev):
+                return True
+                    
+        return False
+    
+    def add_dependencies(self, packages: List[str], dev: bool = False, manager: Optional[str] = None) -> bool:
+        """Add several dependencies to project with a single command.
+        
+        Args:
+            packages: Packages to add
+            dev: Whether to add as dev dependencies
+            manager: Optional package manager to use
+            
+        Returns:
+            bool: True if packages were added successfully
+        """
+        if not packages:
+            return True
+            
+        selected = self._get_available_manager(manager)
+        if selected:
+            # Use specified manager
+            return selected.add_many(packages, dev)
+            
+        # Try each available package manager
+        for pm in self._available:
+            if pm.add_many(packages, dev):
+                return True
                     
         return False
     
@@ -631,15 +941,15 @@ class DependencyManager:
         Returns:
             bool: True if package was removed successfully
         """
-        if manager and manager in self.available_managers and self.available_managers[manager]:
+        selected = self._get_available_manager(manager)
+        if selected:
             # Use specified manager
-            return self.package_managers[manager]['remove'](package)
+            return selected.remove(package)
             
         # Try each available package manager
-        for name, available in self.available_managers.items():
-            if available:
-                if self.package_managers[name]['remove'](package):
-                    return True
+        for pm in self._available:
+            if pm.remove(package):
+                return True
                     
         return False
     
@@ -653,15 +963,15 @@ class DependencyManager:
         Returns:
             bool: True if update was successful
         """
-        if manager and manager in self.available_managers and self.available_managers[manager]:
+        selected = self._get_available_manager(manager)
+        if selected:
             # Use specified manager
-            return self.package_managers[manager]['update'](package)
+            return selected.update(package)
             
         # Try each available package manager
-        for name, available in self.available_managers.items():
-            if available:
-                if self.package_managers[name]['update'](package):
-                    return True
+        for pm in self._available:
+            if pm.update(package):
+                return True
                     
         return False
     
@@ -674,20 +984,29 @@ class DependencyManager:
         Returns:
             List[Dict[str, str]]: List of package information
         """
-        if manager and manager in self.available_managers and self.available_managers[manager]:
+        selected = self._get_available_manager(manager)
+        if selected:
             # Use specified manager
-            return self.package_managers[manager]['list']()
+            return selected.list()
             
         # Combine results from all available package managers
         all_packages = []
+        names = [pm.name for pm in self._available]
         
-        for name, available in self.available_managers.items():
-            if available:
-                packages = self.package_managers[name]['list']()
-                for pkg in packages:
-                    pkg['manager'] = name
-                    all_packages.append(pkg)
-                    
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop running, so query the managers concurrently
+            results = asyncio.run(self._list_all_async(names))
+        else:
+            # Called from inside an event loop; fall back to serial listing
+            results = [pm.list() for pm in self._available]
+            
+        for name, packages in zip(names, results):
+            for pkg in packages:
+                pkg['manager'] = name
+                all_packages.append(pkg)
+                
         return all_packages
     
     def load_base_requirements(self) -> List[str]:
@@ -696,20 +1015,28 @@ class DependencyManager:
         Returns:
             List[str]: List of base requirements
         """
-        requirements = []
-        
         # Check for requirements.txt
         req_file = self.project_root / 'requirements.txt'
-        if req_file.exists():
-            try:
-                with open(req_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            requirements.append(line)
-            except:
-                pass
-                
+        try:
+            mtime = req_file.stat().st_mtime_ns
+        except OSError:
+            return []
+            
+        # Reuse the cached result while the file is unchanged
+        if self._base_requirements_cache and self._base_requirements_cache[0] == mtime:
+            return list(self._base_requirements_cache[1])
+            
+        try:
+            text = req_file.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return []
+            
+        requirements = [
+            line for line in (raw.strip() for raw in text.splitlines())
+            if line and not line.startswith('#')
+        ]
+        
+        self._base_requirements_cache = (mtime, list(requirements))
         return requirements
     
     def merge_requirements(self, base_requirements: List[str], new_requirements: List[str]) -> List[str]:
@@ -722,22 +1049,16 @@ class DependencyManager:
         Returns:
             List[str]: Merged requirements list
         """
-        # Create set of base requirement names (without version)
-        base_names = set()
+        # Map package name (without version) to its full spec; dicts keep insertion order
+        merged = {}
         for req in base_requirements:
-            # Extract package name (remove version specifiers)
-            name = re.split(r'[<>=!~]', req)[0].strip()
-            base_names.add(name)
+            merged[_REQ_SPLIT.split(req, 1)[0].strip()] = req
             
         # Add new requirements that aren't in base
-        merged = base_requirements.copy()
         for req in new_requirements:
-            name = re.split(r'[<>=!~]', req)[0].strip()
-            if name not in base_names:
-                merged.append(req)
-                base_names.add(name)
-                
-        return merged
+            merged.setdefault(_REQ_SPLIT.split(req, 1)[0].strip(), req)
+            
+        return list(merged.values())
     
     def save_requirements(self, requirements: List[str]) -> bool:
         """Save requirements to requirements.txt.
@@ -750,13 +1071,28 @@ class DependencyManager:
         """
         try:
             req_file = self.project_root / 'requirements.txt'
-            with open(req_file, 'w', encoding='utf-8') as f:
-                for req in requirements:
-                    f.write(f"{req}\n")
+            content = '\n'.join(requirements) + '\n' if requirements else ''
+            self._write_file_atomic(req_file, content)
             return True
         except:
             return False
     
+    def _write_file_atomic(self, file_path: Path, content: str):
+        """Write file contents through a temporary file and atomic rename.
+        
+        Args:
+            file_path: Path to file
+            content: File contents
+        """
+        tmp_path = file_path.with_name(file_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content.encode('utf-8'))
+            os.replace(tmp_path, file_path)
+        except:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
     def get_dependency_file(self, manager: Optional[str] = None) -> Optional[Path]:
         """Get path to dependency file.
         
@@ -767,17 +1103,14 @@ class DependencyManager:
             Optional[Path]: Path to dependency file
         """
         if manager and manager in self.package_managers:
-            file_name = self.package_managers[manager]['file']
-            file_path = self.project_root / file_name
+            file_path = self.project_root / self.package_managers[manager].file
             if file_path.exists():
                 return file_path
                 
         # Try each available package manager
-        for name, available in self.available_managers.items():
-            if available:
-                file_name = self.package_managers[name]['file']
-                file_path = self.project_root / file_name
-                if file_path.exists():
-                    return file_path
+        for pm in self._available:
+            file_path = self.project_root / pm.file
+            if file_path.exists():
+                return file_path
                     
         return None
\ No newline at end of file
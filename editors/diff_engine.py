@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Line diff engine based on Myers' O(ND) algorithm."""
+import difflib
+from array import array
+from typing import Optional, Callable, List, Sequence, Tuple, Iterator
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+    HAS_CDIFFLIB = True
+except ImportError:
+    from difflib import SequenceMatcher
+    HAS_CDIFFLIB = False
+
+# Edit script operations
+KEEP = 0
+INSERT = 1
+DELETE = 2
+
+# Largest number of saved search states before falling back to difflib.
+# The greedy search keeps O(D^2) of them and does O(D^2) work besides the
+# snakes; past roughly D = 512 difflib's SequenceMatcher is faster
+MAX_TRACE_SIZE = 1 << 18
+
+Opcode = Tuple[str, int, int, int, int]
+
+# Inputs with at least this many lines are diffed by the compiled kernel,
+# which can afford a much longer search before falling back
+JIT_MIN_LINES = 256
+JIT_MAX_TRACE_SIZE = 1 << 22
+
+# Compiled kernel; None until first needed, False if numba is unavailable
+_jit_kernel = None
+
+def intern_lines(a: Sequence[str], b: Sequence[str]) -> Tuple[array, array]:
+    """Map every distinct line of both sequences to a small integer.
+    
+    Args:
+        a: First sequence of lines
+        b: Second sequence of lines
+    
+    Returns:
+        Tuple[array, array]: Line ids of a and b; equal lines share an id
+    """
+    ids = {}
+    setdefault = ids.setdefault
+    a_ids = array('i', [setdefault(line, len(ids)) for line in a])
+    b_ids = array('i', [setdefault(line, len(ids)) for line in b])
+    return a_ids, b_ids
+
+def myers_edit_script(a: Sequence[int], b: Sequence[int]) -> bytearray:
+    """Find a shortest edit script turning a into b.
+    
+    Greedy forward search over furthest-reaching D-paths, keeping the
+    diagonal states of each step for the backtrack.
+    
+    Args:
+        a: First sequence
+        b: Second sequence
+    
+    Returns:
+        bytearray: KEEP, INSERT and DELETE operations in order
+    
+    Raises:
+        MemoryError: If the inputs differ too much to trace in MAX_TRACE_SIZE
+    """
+    n = len(a)
+    m = len(b)
+    max_d = n + m
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    trace_size = 0
+    
+    # Forward search
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            trace.append(v[offset - d:offset + d + 1])
+            trace_size += 2 * d + 1
+            if trace_size > MAX_TRACE_SIZE:
+                raise MemoryError("inputs differ too much for a traced diff")
+            continue
+        break
+    
+    # Backtrack from the end, collecting operations in reverse
+    ops = bytearray()
+    x = n
+    y = m
+    for d in range(d, 0, -1):
+        prev = trace[d - 1]
+        k = x - y
+        if k == -d or (k != d and prev[k - 1 + d - 1] < prev[k + 1 + d - 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = prev[prev_k + d - 1]
+        prev_y = prev_x - prev_k
+        
+        while x > prev_x and y > prev_y:
+            ops.append(KEEP)
+            x -= 1
+            y -= 1
+        ops.append(INSERT if prev_k == k + 1 else DELETE)
+        x = prev_x
+        y = prev_y
+    
+    ops.extend(bytes(x))
+    ops.reverse()
+    return ops
+
+def _myers_ond(a, b):
+    """Find a shortest edit script turning a into b, over numpy arrays.
+    
+    Same search as myers_edit_script, written for numba: the diagonal
+    array is allocated once and step states go into one flat buffer,
+    where the state of step d starts at offset d * d.
+    
+    Args:
+        a: First sequence of line ids
+        b: Second sequence of line ids
+    
+    Returns:
+        np.ndarray: int8 KEEP, INSERT and DELETE operations in order
+    """
+    n = a.shape[0]
+    m = b.shape[0]
+    max_d = n + m
+    offset = max_d + 1
+    v = np.zeros(2 * max_d + 3, dtype=np.int64)
+    trace = np.empty(1024, dtype=np.int32)
+    
+    # Forward search
+    found = 0
+    for d in range(max_d + 1):
+        done = False
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                done = True
+                break
+        if done:
+            found = d
+            break
+        
+        end = (d + 1) * (d + 1)
+        if end > JIT_MAX_TRACE_SIZE:
+            raise MemoryError("inputs differ too much for a traced diff")
+        if end > trace.shape[0]:
+            grown = np.empty(max(end, 2 * trace.shape[0]), dtype=np.int32)
+            grown[:d * d] = trace[:d * d]
+            trace = grown
+        trace[d * d:end] = v[offset - d:offset + d + 1]
+    
+    # Backtrack from the end, filling operations from the back
+    ops = np.empty(n + m, dtype=np.int8)
+    pos = n + m
+    x = n
+    y = m
+    for d in range(found, 0, -1):
+        base = (d - 1) * (d - 1) + d - 1
+        k = x - y
+        if k == -d or (k != d and trace[base + k - 1] < trace[base + k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = trace[base + prev_k]
+        prev_y = prev_x - prev_k
+        
+        while x > prev_x and y > prev_y:
+            pos -= 1
+            ops[pos] = KEEP
+            x -= 1
+            y -= 1
+        pos -= 1
+        ops[pos] = INSERT if prev_k == k + 1 else DELETE
+        x = prev_x
+        y = prev_y
+    
+    while x > 0:
+        pos -= 1
+        ops[pos] = KEEP
+        x -= 1
+    return ops[pos:]
+
+def _get_jit_kernel() -> Optional[Callable]:
+    """Compile _myers_ond with numba on first use.
+    
+    Returns:
+        Optional[Callable]: Compiled kernel, None if numba is not installed
+    """
+    global _jit_kernel
+    if _jit_kernel is None:
+        _jit_kernel = False
+        if HAS_NUMPY:
+            try:
+                import numba
+                # nogil lets diffs running in separate threads search in parallel
+                _jit_kernel = numba.njit(cache=True, boundscheck=False, nogil=True)(_myers_ond)
+            except ImportError:
+                pass
+    return _jit_kernel or None
+
+def jit_available() -> bool:
+    """Check whether large diffs run in the compiled, GIL-free kernel.
+    
+    Returns:
+        bool: True if numba and numpy are installed
+    """
+    return _get_jit_kernel() is not None
+
+def script_opcodes(ops: bytearray) -> List[Opcode]:
+    """Convert an edit script to difflib-style opcodes.
+    
+    Args:
+        ops: Edit script from myers_edit_script
+    
+    Returns:
+        List[Opcode]: (tag, i1, i2, j1, j2) tuples as from SequenceMatcher.get_opcodes
+    """
+    opcodes = []
+    i = j = 0
+    pos = 0
+    total = len(ops)
+    while pos < total:
+        i1 = i
+        j1 = j
+        if ops[pos] == KEEP:
+            while pos < total and ops[pos] == KEEP:
+                i += 1
+                j += 1
+                pos += 1
+            opcodes.append(('equal', i1, i, j1, j))
+            continue
+        
+        # Deletions and insertions between two matches form one change
+        while pos < total and ops[pos] != KEEP:
+            if ops[pos] == DELETE:
+                i += 1
+            else:
+                j += 1
+            pos += 1
+        if i > i1 and j > j1:
+            tag = 'replace'
+        elif i > i1:
+            tag = 'delete'
+        else:
+            tag = 'insert'
+        opcodes.append((tag, i1, i, j1, j))
+    
+    return opcodes
+
+def _expand_opcodes(opcodes: List[Opcode], a_keep: List[int], b_keep: List[int],
+                    n: int, m: int) -> List[Opcode]:
+    """Map opcodes of filtered sequences back to the full sequences.
+    
+    Args:
+        opcodes: Opcodes of the filtered sequences
+        a_keep: Full index of every line kept from the first sequence
+        b_keep: Full index of every line kept from the second sequence
+        n: Length of the first full sequence
+        m: Length of the second full sequence
+    
+    Returns:
+        List[Opcode]: (tag, i1, i2, j1, j2) tuples over the full sequences
+    """
+    # Matched runs in full coordinates; dropped lines split a filtered run
+    blocks = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag != 'equal':
+            continue
+        for k in range(i2 - i1):
+            i = a_keep[i1 + k]
+            j = b_keep[j1 + k]
+            if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+                blocks[-1][2] += 1
+            else:
+                blocks.append([i, j, 1])
+    blocks.append([n, m, 0])
+    
+    # Everything between two runs is one change, as in SequenceMatcher.get_opcodes
+    expanded = []
+    i = j = 0
+    for ai, bj, size in blocks:
+        if i < ai and j < bj:
+            expanded.append(('replace', i, ai, j, bj))
+        elif i < ai:
+            expanded.append(('delete', i, ai, j, bj))
+        elif j < bj:
+            expanded.append(('insert', i, ai, j, bj))
+        i = ai + size
+        j = bj + size
+        if size:
+            expanded.append(('equal', ai, i, bj, j))
+    
+    return expanded
+
+def get_opcodes(a: Sequence[str], b: Sequence[str]) -> List[Opcode]:
+    """Compute opcodes turning a into b.
+    
+    The common head and tail are matched directly; only the lines in
+    between are diffed.
+    
+    Args:
+        a: First sequence of lines
+        b: Second sequence of lines
+    
+    Returns:
+        List[Opcode]: (tag, i1, i2, j1, j2) tuples as from SequenceMatcher.get_opcodes
+    """
+    n = len(a)
+    m = len(b)
+    
+    # Strip the common prefix and suffix
+    prefix = 0
+    limit = min(n, m)
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and a[n - 1 - suffix] == b[m - 1 - suffix]:
+        suffix += 1
+    
+    opcodes = []
+    if prefix:
+        opcodes.append(('equal', 0, prefix, 0, prefix))
+    if prefix < n - suffix or prefix < m - suffix:
+        for tag, i1, i2, j1, j2 in _diff_opcodes(a[prefix:n - suffix], b[prefix:m - suffix]):
+            opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(('equal', n - suffix, n, m - suffix, m))
+    
+    return opcodes
+
+def _diff_opcodes(a: Sequence[str], b: Sequence[str]) -> List[Opcode]:
+    """Diff two sequences of lines.
+    
+    Lines are interned to integers and diffed with Myers' algorithm,
+    compiled with numba when it is installed; SequenceMatcher (the cdifflib
+    C implementation when installed) is used only for inputs too different
+    to trace. Like git's xdiff, lines occurring in only one sequence are
+    dropped before the search: they can never match, and leaving them out
+    shrinks both the inputs and the edit distance to trace.
+    
+    Args:
+        a: First sequence of lines
+        b: Second sequence of lines
+    
+    Returns:
+        List[Opcode]: (tag, i1, i2, j1, j2) tuples as from SequenceMatcher.get_opcodes
+    """
+    a_ids, b_ids = intern_lines(a, b)
+    in_a = set(a_ids)
+    in_b = set(b_ids)
+    a_keep = [i for i, line_id in enumerate(a_ids) if line_id in in_b]
+    b_keep = [j for j, line_id in enumerate(b_ids) if line_id in in_a]
+    filtered = len(a_keep) < len(a_ids) or len(b_keep) < len(b_ids)
+    if filtered:
+        a_ids = array('i', [a_ids[i] for i in a_keep])
+        b_ids = array('i', [b_ids[j] for j in b_keep])
+    
+    try:
+        if not a_ids or not b_ids:
+            # Nothing can match; the whole input is one change
+            opcodes = []
+        else:
+            kernel = _get_jit_kernel() if len(a_ids) + len(b_ids) >= JIT_MIN_LINES else None
+            if kernel is not None:
+                ops = kernel(np.frombuffer(a_ids, dtype=np.int32), np.frombuffer(b_ids, dtype=np.int32))
+                opcodes = script_opcodes(bytearray(ops.tobytes()))
+            else:
+                opcodes = script_opcodes(myers_edit_script(a_ids, b_ids))
+        if filtered:
+            return _expand_opcodes(opcodes, a_keep, b_keep, len(a), len(b))
+        return opcodes
+    except MemoryError:
+        return SequenceMatcher(None, a, b).get_opcodes()
+
+def group_opcodes(opcodes: List[Opcode], n: int = 3) -> Iterator[List[Opcode]]:
+    """Split opcodes into change clusters with up to n lines of context.
+    
+    Same grouping as SequenceMatcher.get_grouped_opcodes.
+    
+    Args:
+        opcodes: Opcodes of the whole input
+        n: Context lines
+    
+    Yields:
+        List[Opcode]: Opcodes of one cluster
+    """
+    codes = list(opcodes) or [('equal', 0, 1, 0, 1)]
+    
+    # Fixup leading and trailing groups if they show no changes
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    
+    nn = n + n
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # End the current group on a long run without changes
+        if tag == 'equal' and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a line range for a unified diff hunk header.
+    
+    Args:
+        start: First line index
+        stop: End line index (exclusive)
+    
+    Returns:
+        str: Range in 'start,length' form
+    """
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+def unified_diff(a: Sequence[str], b: Sequence[str], fromfile: str = '', tofile: str = '', n: int = 3) -> List[str]:
+    """Build a unified diff, formatted like difflib.unified_diff with lineterm=''.
+    
+    Args:
+        a: First sequence of lines
+        b: Second sequence of lines
+        fromfile: Name of the first file
+        tofile: Name of the second file
+        n: Context lines
+    
+    Returns:
+        List[str]: Diff lines; empty if the inputs are equal
+    """
+    diff = []
+    for group in group_opcodes(get_opcodes(a, b), n):
+        if not diff:
+            diff.append(f"--- {fromfile}")
+            diff.append(f"+++ {tofile}")
+        
+        first = group[0]
+        last = group[-1]
+        diff.append(f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@")
+        
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                diff.extend(' ' + line for line in a[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                diff.extend('-' + line for line in a[i1:i2])
+            if tag in ('replace', 'insert'):
+                diff.extend('+' + line for line in b[j1:j2])
+    
+    return diff
+
+class _MyersDiffer(difflib.Differ):
+    """Differ that aligns lines with Myers' algorithm."""
+    
+    def compare(self, a, b):
+        for tag, alo, ahi, blo, bhi in get_opcodes(a, b):
+            if tag == 'replace':
+                # Intraline '?' hints are still computed by difflib
+                g = self._fancy_replace(a, alo, ahi, b, blo, bhi)
+            elif tag == 'delete':
+                g = self._dump('-', a, alo, ahi)
+            elif tag == 'insert':
+                g = self._dump('+', b, blo, bhi)
+            else:
+                g = self._dump(' ', a, alo, ahi)
+            yield from g
+
+def ndiff(a: Sequence[str], b: Sequence[str]) -> List[str]:
+    """Build a Differ-style delta, formatted like difflib.ndiff.
+    
+    Args:
+        a: First sequence of lines
+        b: Second sequence of lines
+    
+    Returns:
+        List[str]: Delta lines
+    """
+    return list(_MyersDiffer(None, difflib.IS_CHARACTER_JUNK).compare(a, b))
@@ -2,13 +2,142 @@
 # -*- coding: utf-8 -*-
 """Base editor component for ANJ DEV terminal."""
 import os
+import time
 import curses
+import functools
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
+from pygments.lexer import Lexer
+from pygments.lexers import find_lexer_class_for_filename
+from editors.line_buffer import LineBuffer
+
+# Recently loaded files keyed by (path, mtime_ns, size); editors receive copies
+_FILE_CACHE: "OrderedDict[Tuple[str, int, int], LineBuffer]" = OrderedDict()
+FILE_CACHE_SIZE = 8
+
+def _file_cache_key(path: Path) -> Tuple[str, int, int]:
+    """Build file cache key from the current state of a file.
+    
+    Args:
+        path: Path to file
+        
+    Returns:
+        Tuple[str, int, int]: Path, modification time and size
+    """
+    st = path.stat()
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+def _cache_file(key: Tuple[str, int, int], buffer: LineBuffer):
+    """Store buffer in the file cache, evicting the least recently used entry.
+    
+    Args:
+        key: File cache key
+        buffer: Buffer holding the file content
+    """
+    _FILE_CACHE[key] = buffer
+    _FILE_CACHE.move_to_end(key)
+    if len(_FILE_CACHE) > FILE_CACHE_SIZE:
+        _FILE_CACHE.popitem(last=False)
+
+@functools.lru_cache(maxsize=256)
+def _status_prefix(line: int, col: int, mode: Optional[str], file_type: Optional[str]) -> str:
+    """Build the cursor/mode/file-type part of the status bar.
+    
+    Args:
+        line: 1-based line number
+        col: 1-based column number
+        mode: Optional editor mode
+        file_type: Optional file type label
+        
+    Returns:
+        str: Status bar prefix
+    """
+    status = f" Ln {line}, Col {col}"
+    if mode is not None:
+        status += f" | {mode.upper()}"
+    if file_type is not None:
+        status += f" | {file_type}"
+    return status
+
+@functools.lru_cache(maxsize=16)
+def _format_size(size: int) -> str:
+    """Format a file size for display.
+    
+    Args:
+        size: Size in bytes
+        
+    Returns:
+        str: Human readable size
+    """
+    if size > 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size > 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} bytes"
+
+@functools.lru_cache(maxsize=1024)
+def _line_number(line: int, width: int) -> str:
+    """Format a line number for the gutter.
+    
+    Args:
+        line: 1-based line number
+        width: Width to right-align the number to
+        
+    Returns:
+        str: Padded line number followed by a separating space
+    """
+    return str(line).rjust(width) + " "
+
+@functools.lru_cache(maxsize=64)
+def _shared_lexer(lexer_class: type, stripnl: bool) -> Lexer:
+    """Get the lexer instance shared by all editors of a language.
+    
+    Args:
+        lexer_class: Pygments lexer class
+        stripnl: Whether the lexer strips leading and trailing newlines
+        
+    Returns:
+        Lexer: Lexer instance
+    """
+    return lexer_class(stripnl=stripnl)
+
+@functools.lru_cache(maxsize=256)
+def _lexer_for_filename(filename: str, stripnl: bool = True) -> Optional[Lexer]:
+    """Get the Pygments lexer for a file name.
+    
+    Each name is matched against Pygments' filename patterns only once.
+    
+    Args:
+        filename: File name; any directories are ignored
+        stripnl: Whether the lexer strips leading and trailing newlines
+        
+    Returns:
+        Optional[Lexer]: Shared lexer instance, or None if no lexer matches
+    """
+    lexer_class = find_lexer_class_for_filename(filename)
+    if lexer_class is None:
+        return None
+    return _shared_lexer(lexer_class, stripnl)
 
 class EditorComponent:
     """Base class for editor components."""
     
+    # Fixed slots for the state read on every frame; subclasses keep a __dict__
+    __slots__ = (
+        'stdscr', 'filepath', 'height', 'width', 'content',
+        'cursor_y', 'cursor_x', 'scroll_pos', 'is_modified',
+        'status_message', 'status_time', 'colors',
+        '_size_str', '_size_checked', '_prev_lines', '_drawn_rows',
+        '_visible_key', '_visible_cache', '_blank',
+    )
+    
+    # Seconds between file size checks for the title bar
+    STAT_INTERVAL = 0.5
+    
+    # Most queued keys handled before the screen is repainted
+    MAX_KEYS_PER_FRAME = 32
+    
     def __init__(self, stdscr, filepath: Optional[Path] = None):
         """Initialize editor component.
         
@@ -21,7 +150,7 @@ class EditorComponent:
         self.height, self.width = stdscr.getmaxyx()
         
         # Editor state
-        self.content = []
+        self.content = LineBuffer()
         self.cursor_y = 0
         self.cursor_x = 0
         self.scroll_pos = 0
@@ -29,6 +158,21 @@ class EditorComponent:
         self.status_message = ""
         self.status_time = 0
         
+        # Cached file size label for the title bar
+        self._size_str = ""
+        self._size_checked = float('-inf')
+        
+        # Rows written in the previous frame and rows drawn in the current one
+        self._prev_lines: Dict[int, Tuple[Tuple[int, str, int], ...]] = {}
+        self._drawn_rows = set()
+        
+        # Last visible window and the view state it was built for
+        self._visible_key = None
+        self._visible_cache: List[Tuple[int, str]] = []
+        
+        # Row of spaces sliced for bar padding
+        self._blank = " " * self.width
+        
         # Color pairs
         self.colors = {
             "normal": curses.color_pair(0),
@@ -52,6 +196,11 @@ class EditorComponent:
         """
         self.height = height
         self.width = width
+        self._blank = " " * width
+        
+        # Force a full repaint at the new size
+        self._prev_lines.clear()
+        self.stdscr.clear()
     
     def load_file(self) -> bool:
         """Load file content.
@@ -64,14 +213,19 @@ class EditorComponent:
             return False
             
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                self.content = f.read().splitlines()
-                
-            # Handle empty file
-            if not self.content:
-                self.content = [""]
-                
+            # Reuse the buffer of a recently opened, unchanged file
+            key = _file_cache_key(self.filepath)
+            buffer = _FILE_CACHE.get(key)
+            if buffer is None:
+                # Lines are decoded lazily as they are displayed
+                buffer = LineBuffer.from_file(self.filepath)
+            _cache_file(key, buffer)
+            
+            # The copy shares the file data, so edits never reach the cache
+            self.content = buffer.copy()
+            
             self.is_modified = False
+            self._size_checked = float('-inf')
             self.set_status(f"Loaded {self.filepath.name}")
             return True
             
@@ -93,10 +247,19 @@ class EditorComponent:
             # Create parent directories if needed
             self.filepath.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(self.content))
+            # Stream lines out instead of joining the whole file in memory
+            with open(self.filepath, 'wb', buffering=1 << 20) as f:
+                self.content.write_to(f)
+                
+            # Edits only replace slots; untouched lines still point into the
+            # loaded bytes, so the buffer is cached as-is instead of being
+            # rescanned on the next load. A trailing empty line would not
+            # survive a reload, so that case is left to the disk.
+            if len(self.content) == 1 or self.content[-1]:
+                _cache_file(_file_cache_key(self.filepath), self.content.copy())
                 
             self.is_modified = False
+            self._size_checked = float('-inf')
             self.set_status(f"Saved {self.filepath.name}")
             return True
             
@@ -105,21 +268,14 @@ class EditorComponent:
             return False
     
     def set_status(self, message: str):
-        """Set status message.
+        """Set status message, shown when the next frame is drawn.
         
         Args:
             message: Status message
         """
+        # Several messages set while handling one key cost a single status bar write
         self.status_message = message
-        
-        # Update status line
-        try:
-            self.stdscr.move(self.height - 1, 0)
-            self.stdscr.clrtoeol()
-            self.stdscr.addstr(self.height - 1, 0, message, self.colors["status"])
-            self.stdscr.refresh()
-        except curses.error:
-            pass
+        self.status_time = time.monotonic()
     
     def move_cursor(self, y_diff: int, x_diff: int):
         """Move cursor by given amount.
@@ -128,6 +284,12 @@ class EditorComponent:
             y_diff: Vertical movement
             x_diff: Horizontal movement
         """
+        # Bind state to locals; this runs on every arrow key
+        content = self.content
+        n = len(content)
+        h = self.height
+        sp = self.scroll_pos
+        
         # Calculate new position
         new_y = self.cursor_y + y_diff
         new_x = self.cursor_x + x_diff
@@ -135,32 +297,49 @@ class EditorComponent:
         # Validate vertical position
         if new_y < 0:
             # Scroll up if needed
-            if self.scroll_pos > 0:
-                self.scroll_pos = max(0, self.scroll_pos - 1)
-                new_y = 0
-            else:
-                new_y = 0
-        elif new_y >= self.height - 2:
+            if sp > 0:
+                sp -= 1
+            new_y = 0
+        elif new_y >= h - 2:
             # Scroll down if needed
-            if self.scroll_pos + new_y < len(self.content):
-                self.scroll_pos += 1
-                new_y = self.height - 3
+            if sp + new_y < n:
+                sp += 1
+                new_y = h - 3
             else:
-                new_y = min(self.height - 3, len(self.content) - self.scroll_pos - 1)
+                new_y = min(h - 3, n - sp - 1)
                 
         # Validate horizontal position
         if new_x < 0:
             new_x = 0
         else:
-            # Get current line length
-            current_line = self.scroll_pos + new_y
-            if current_line < len(self.content):
-                line_length = len(self.content[current_line])
-                new_x = min(new_x, line_length)
-                
+            # Clamp to current line length
+            current_line = sp + new_y
+            if current_line < n:
+                line_length = content.line_length(current_line)
+                if new_x > line_length:
+                    new_x = line_length
+                    
         # Update cursor position
-        self.cursor_y = max(0, new_y)
-        self.cursor_x = max(0, new_x)
+        self.scroll_pos = sp
+        self.cursor_y = 0 if new_y < 0 else new_y
+        self.cursor_x = new_x
+    
+    def goto_line(self, line_idx: int, col: int = 0):
+        """Scroll just enough to show a line and place the cursor on it.
+        
+        Args:
+            line_idx: 0-based line index
+            col: Cursor column
+        """
+        # Adjust scroll position
+        if line_idx < self.scroll_pos:
+            self.scroll_pos = line_idx
+        elif line_idx >= self.scroll_pos + self.height - 2:
+            self.scroll_pos = line_idx - (self.height - 3)
+            
+        # Set cursor position
+        self.cursor_y = line_idx - self.scroll_pos
+        self.cursor_x = col
     
     def get_visible_content(self) -> List[Tuple[int, str]]:
         """Get content visible in the current view.
@@ -168,11 +347,20 @@ class EditorComponent:
         Returns:
             List of (line_number, line_content) tuples
         """
+        content = self.content
+        
+        # Reuse the previous window until the view scrolls, resizes or the buffer changes
+        key = (self.scroll_pos, self.height, content, content.version)
+        if key == self._visible_key:
+            return self._visible_cache
+            
         max_lines = self.height - 2  # Account for title and status bars
         start_line = self.scroll_pos
-        end_line = min(start_line + max_lines, len(self.content))
+        end_line = min(start_line + max_lines, len(content))
         
-        return [(i, self.content[i]) for i in range(start_line, end_line)]
+        self._visible_cache = [(i, content[i]) for i in range(start_line, end_line)]
+        self._visible_key = key
+        return self._visible_cache
     
     def draw_title_bar(self):
         """Draw title bar with file information."""
@@ -181,52 +369,116 @@ class EditorComponent:
             title += " [Modified]"
             
         # Add file info
-        if self.filepath and self.filepath.exists():
-            size = self.filepath.stat().st_size
-            size_str = f"{size} bytes"
-            if size > 1024:
-                size_str = f"{size / 1024:.1f} KB"
-            if size > 1024 * 1024:
-                size_str = f"{size / (1024 * 1024):.1f} MB"
-                
+        size_str = self._file_size_str()
+        if size_str:
             title += f" - {size_str}"
             
         # Fill with spaces
-        padding = " " * (self.width - len(title) - 1)
+        padding = self._blank[:max(0, self.width - len(title) - 1)]
         
-        try:
-            self.stdscr.addstr(0, 0, title, self.colors["title"])
-            self.stdscr.addstr(0, len(title), padding)
-        except curses.error:
-            pass
+        self._set_line(0, ((0, title, self.colors["title"]), (len(title), padding, 0)))
     
-    def draw_status_bar(self):
-        """Draw status bar with cursor position and status message."""
-        # Create status line
-        status = f" Ln {self.scroll_pos + self.cursor_y + 1}, Col {self.cursor_x + 1}"
+    def _file_size_str(self) -> str:
+        """Get file size label, re-checking the file at most every STAT_INTERVAL.
         
-        # Add mode if applicable
-        if hasattr(self, 'mode'):
-            status += f" | {self.mode.upper()}"
+        Returns:
+            str: Formatted file size, or empty string if file doesn't exist
+        """
+        now = time.monotonic()
+        if now - self._size_checked < self.STAT_INTERVAL:
+            return self._size_str
             
-        # Add file type if applicable
+        self._size_checked = now
+        self._size_str = ""
         if self.filepath:
-            status += f" | {self.filepath.suffix[1:].upper()}"
+            try:
+                size = self.filepath.stat().st_size
+            except OSError:
+                return self._size_str
+            self._size_str = _format_size(size)
             
+        return self._size_str
+    
+    def draw_status_bar(self):
+        """Draw status bar with cursor position and status message."""
+        # Create status line with mode and file type if applicable
+        status = _status_prefix(
+            self.scroll_pos + self.cursor_y + 1,
+            self.cursor_x + 1,
+            getattr(self, 'mode', None),
+            self.filepath.suffix[1:].upper() if self.filepath else None
+        )
+        
         # Add status message
         if self.status_message:
             message = f" | {self.status_message}"
             status += message
             
         # Fill with spaces
-        padding = " " * (self.width - len(status) - 1)
+        padding = self._blank[:max(0, self.width - len(status) - 1)]
+        
+        self._set_line(self.height - 1, ((0, status, self.colors["status"]), (len(status), padding, 0)))
+    
+    def _set_line(self, y: int, segments: Tuple[Tuple[int, str, int], ...]):
+        """Draw a screen row, skipping the write if it matches the previous frame.
         
+        Args:
+            y: Screen row
+            segments: (x, text, attr) spans making up the row, drawn in order
+        """
+        segments = tuple(segments)
+        self._drawn_rows.add(y)
+        if self._prev_lines.get(y) == segments:
+            return
+            
+        self._prev_lines[y] = segments
+        if not 0 <= y < self.height:
+            return
+            
         try:
-            self.stdscr.addstr(self.height - 1, 0, status, self.colors["status"])
-            self.stdscr.addstr(self.height - 1, len(status), padding)
+            self.stdscr.move(y, 0)
+            self.stdscr.clrtoeol()
         except curses.error:
+            # The window may have shrunk since the size was last read
+            return
+        for x, text, attr in segments:
+            self._safe_addstr(y, x, text, attr)
+    
+    def _safe_addstr(self, y: int, x: int, text: str, attr: int = 0):
+        """Write text clipped to the window, skipping positions outside it.
+        
+        Args:
+            y: Screen row
+            x: Screen column
+            text: Text to write
+            attr: Curses attributes
+        """
+        width = self.width
+        if y < 0 or y >= self.height or x < 0 or x >= width - 1:
+            return
+            
+        # Clip to the row so long lines never wrap onto the next one
+        if len(text) > width - x - 1:
+            text = text[:width - x - 1]
+        try:
+            self.stdscr.addstr(y, x, text, attr)
+        except curses.error:
+            # Double-width characters can still run past the last column
             pass
     
+    def _clear_stale_lines(self):
+        """Blank rows drawn in the previous frame but not in the current one."""
+        for y in [y for y in self._prev_lines if y not in self._drawn_rows]:
+            del self._prev_lines[y]
+            if y < self.height:
+                try:
+                    self.stdscr.move(y, 0)
+                    self.stdscr.clrtoeol()
+                except curses.error:
+                    pass
+                
+        self._drawn_rows = set()
+    
     def draw(self):
         """Draw editor content. To be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement draw()")
@@ -242,6 +494,42 @@ class EditorComponent:
         """
         raise NotImplementedError("Subclasses must implement handle_input()")
     
+    def _handle_pending_input(self, key: int) -> bool:
+        """Handle a key and any keys already waiting, then return to redraw.
+        
+        Held or repeated keys are applied in one batch so the editor paints
+        once per burst instead of once per key.
+        
+        Args:
+            key: Key code from getch()
+            
+        Returns:
+            bool: True if editor should continue, False to exit
+        """
+        for _ in range(self.MAX_KEYS_PER_FRAME):
+            # curses has already resized stdscr; redraw at the new size first
+            if key == curses.KEY_RESIZE:
+                return True
+                
+            if not self.handle_input(key):
+                return False
+                
+            # Input prompts draw on the status row directly
+            self._prev_lines.pop(self.height - 1, None)
+            
+            # Read the next key without waiting; prompts still get blocking reads
+            self.stdscr.nodelay(True)
+            try:
+                key = self.stdscr.getch()
+            finally:
+                self.stdscr.nodelay(False)
+                
+            if key == -1:
+                return True
+                
+        curses.ungetch(key)
+        return True
+    
     def run(self) -> Optional[Any]:
         """Run editor main loop.
         
@@ -257,18 +545,18 @@ class EditorComponent:
             
             # Main loop
             while True:
-                # Handle resize if needed
+                # Handle resize if needed. getmaxyx only reads the window
+                # struct, so checking every frame is cheap and also catches
+                # resizes whose KEY_RESIZE a popup or prompt consumed
                 new_height, new_width = self.stdscr.getmaxyx()
                 if new_height != self.height or new_width != self.width:
                     self.resize(new_height, new_width)
                 
-                # Clear screen
-                self.stdscr.clear()
-                
-                # Draw components
+                # Draw components; only rows that changed are rewritten
                 self.draw_title_bar()
                 self.draw()
                 self.draw_status_bar()
+                self._clear_stale_lines()
                 
                 # Position cursor
                 try:
@@ -276,14 +564,18 @@ class EditorComponent:
                 except curses.error:
                     pass
                 
-                # Refresh screen
-                self.stdscr.refresh()
+                # Send the frame in one update; touching the whole window also
+                # repaints rows left covered by closed popups, and curses only
+                # transmits the cells that actually differ
+                self.stdscr.touchwin()
+                self.stdscr.noutrefresh()
+                curses.doupdate()
                 
                 # Get input
                 key = self.stdscr.getch()
                 
-                # Handle input
-                if not self.handle_input(key):
+                # Handle input, including keys queued up while drawing
+                if not self._handle_pending_input(key):
                     break
                     
             # Return result
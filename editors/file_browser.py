@@ -3,14 +3,187 @@
 """File browser component for navigating directory structure."""
 import curses
 import os
+import stat
+import time
 import shutil
+import queue
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, Callable
-from editors.editor_base import EditorComponent
+from typing import Optional, List, Dict, Any, Tuple, Callable, Iterable
+from editors.editor_base import EditorComponent, _format_size
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+@lru_cache(maxsize=4096)
+def _format_mtime(minute: int) -> str:
+    """Format a modification time for display.
+    
+    Args:
+        minute: Modification time in whole minutes since the epoch
+        
+    Returns:
+        str: Local date and time
+    """
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(minute * 60))
+
+@dataclass
+class DirEntries:
+    """Directory entries stored as parallel lists, one list per field."""
+    
+    paths: List[str] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    name_lowers: List[str] = field(default_factory=list)
+    suffixes: List[str] = field(default_factory=list)
+    is_hidden: bytearray = field(default_factory=bytearray)
+    is_dirs: List[bool] = field(default_factory=list)
+    sizes: array = field(default_factory=lambda: array('q'))
+    mtimes: array = field(default_factory=lambda: array('d'))
+    
+    # False while sizes and mtimes are placeholders awaiting stat()
+    has_stats: bool = True
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def _columns(self) -> Tuple[list, ...]:
+        return (self.paths, self.names, self.name_lowers, self.suffixes,
+                self.is_hidden, self.is_dirs, self.sizes, self.mtimes)
+    
+    def insert(self, index: int, path: str, name: str, is_dir: bool, size: int, mtime: float):
+        """Insert an entry, deriving its lookup fields from the name.
+        
+        Args:
+            index: Position of the new entry
+            path: Entry path
+            name: Entry name
+            is_dir: Whether the entry is a directory
+            size: Size in bytes
+            mtime: Modification time
+        """
+        values = (path, name, name.lower(), os.path.splitext(name)[1].lower(),
+                  name.startswith('.'), is_dir, size, mtime)
+        for column, value in zip(self._columns(), values):
+            column.insert(index, value)
+    
+    def append(self, path: str, name: str, is_dir: bool, size: int, mtime: float):
+        """Append an entry.
+        
+        Args:
+            path: Entry path
+            name: Entry name
+            is_dir: Whether the entry is a directory
+            size: Size in bytes
+            mtime: Modification time
+        """
+        self.insert(len(self.names), path, name, is_dir, size, mtime)
+    
+    def remove(self, index: int):
+        """Remove an entry.
+        
+        Args:
+            index: Position of the entry
+        """
+        for column in self._columns():
+            del column[index]
+    
+    def take(self, order: Iterable[int]) -> 'DirEntries':
+        """Get the entries at the given indices, in that order.
+        
+        Args:
+            order: Entry indices
+            
+        Returns:
+            DirEntries: New entries
+        """
+        order = list(order)
+        columns = []
+        for column in self._columns():
+            values = [column[i] for i in order]
+            if isinstance(column, array):
+                values = array(column.typecode, values)
+            elif isinstance(column, bytearray):
+                values = bytearray(values)
+            columns.append(values)
+        return DirEntries(*columns)
+
+class DirEventQueue:
+    """Event handler that queues filesystem events for the browser.
+    
+    Events arrive on the watchdog observer thread and are applied to
+    the cached listing on the next directory load.
+    """
+    
+    def __init__(self, path: str, maxsize: int):
+        """Initialize event queue.
+        
+        Args:
+            path: Watched directory
+            maxsize: Maximum number of pending events
+        """
+        self.path = path
+        self.events = queue.Queue(maxsize)
+        
+        # Directory mtime seen right after the latest queued entry change
+        self.dir_mtime: Optional[int] = None
+        
+        # Set when events were dropped and the listing must be rescanned
+        self.overflowed = False
+    
+    def dispatch(self, event):
+        """Queue an event from the observer.
+        
+        Args:
+            event: watchdog filesystem event
+        """
+        try:
+            self.events.put_nowait((event.event_type, os.fsdecode(event.src_path),
+                                    os.fsdecode(getattr(event, "dest_path", "") or "")))
+        except queue.Full:
+            self.overflowed = True
+            return
+            
+        if event.event_type in ("created", "deleted", "moved"):
+            try:
+                self.dir_mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                pass
 
 class FileBrowser(EditorComponent):
     """File browser for navigating directory structure."""
     
+    # Listings at least this long are sorted by size/time with numpy
+    NUMPY_SORT_MIN = 512
+    
+    # Listings at least this long have hidden files masked out with numpy
+    NUMPY_FILTER_MIN = 512
+    
+    # Entries stat'ed serially before deciding whether stat() is slow
+    STAT_PROBE_COUNT = 32
+    
+    # Average stat() time above which the rest are run in parallel threads
+    SLOW_STAT_SECONDS = 0.0005
+    STAT_WORKERS = 8
+    
+    # Number of directory listings kept for reuse while their mtime is unchanged
+    LISTING_CACHE_SIZE = 16
+    
+    # Pending filesystem events kept before falling back to a full rescan
+    MAX_PENDING_EVENTS = 1024
+    
     def __init__(self, stdscr, filepath: Optional[Path] = None):
         """Initialize file browser.
         
@@ -26,9 +199,27 @@ class FileBrowser(EditorComponent):
             
         super().__init__(stdscr, filepath)
         
+        # Entry colors, plain and on the selection bar
+        self.colors.update({
+            "directory": self.colors["normal"] | curses.A_BOLD | curses.color_pair(1),  # Cyan for directories
+            "selected": curses.A_REVERSE,
+        })
+        self.colors["directory_selected"] = self.colors["directory"] | curses.A_REVERSE
+        self.colors["file_selected"] = self.colors["normal"] | curses.A_REVERSE
+        
         # Browser state
         self.current_dir = self.filepath
-        self.files = []
+        self._current_dir_str = os.fspath(self.current_dir)
+        self._at_root = False
+        self.entries = DirEntries()
+        self._row_strs: List[Optional[str]] = []
+        
+        # Size and time column, shown while sorting by them
+        self._detail_strs: List[Optional[str]] = []
+        self._show_details = False
+        
+        # Position of each displayed name, built on first lookup after a change
+        self._name_to_idx: Optional[Dict[str, int]] = None
         self.selected_idx = 0
         self.show_hidden = False
         self.sort_by = "name"  # name, type, size, modified
@@ -37,6 +228,20 @@ class FileBrowser(EditorComponent):
         self.clipboard = None
         self.clipboard_op = None  # "copy" or "cut"
         
+        # Unfiltered entries of the current directory and recent listings by mtime
+        self._raw_entries = DirEntries()
+        self._listing_cache: "OrderedDict[Path, Tuple[int, DirEntries]]" = OrderedDict()
+        
+        # Filesystem watch on the current directory, when watchdog is available
+        self._observer = None
+        self._watch = None
+        self._watch_path: Optional[str] = None
+        self._fs_events: Optional[DirEventQueue] = None
+        
+        # Whether the browser is on screen; loads while hidden are deferred
+        self.visible = True
+        self._dirty = False
+        
         # File operations callback
         self.file_open_callback = None
         
@@ -71,108 +276,507 @@ class FileBrowser(EditorComponent):
     
     def _load_directory(self):
         """Load current directory contents."""
-        self.files = []
+        # String form of the directory; the root is its own dirname
+        self._current_dir_str = os.fspath(self.current_dir)
+        self._at_root = os.path.dirname(self._current_dir_str) == self._current_dir_str
+        
+        if not self.visible:
+            self._dirty = True
+            return
+            
+        self.entries = DirEntries()
+        self._row_strs = []
+        self._detail_strs = []
+        self._name_to_idx = None
         
         try:
-            # Get all files and directories
-            entries = list(self.current_dir.iterdir())
+            self._enumerate_raw()
+            self._apply_view()
+            self.set_status(f"Loaded {len(self.entries)} items")
             
-            # Filter hidden files if needed
-            if not self.show_hidden:
-                entries = [e for e in entries if not e.name.startswith('.')]
+        except PermissionError:
+            self.set_status("Permission denied")
+            self._go_parent()
+        except Exception as e:
+            self.set_status(f"Error: {e}")
+    
+    def _enumerate_raw(self):
+        """Read all entries of the current directory.
+        
+        A cached listing is kept current by the filesystem events of the
+        watched directory, or otherwise reused while the directory's
+        mtime is unchanged.
+        """
+        path = self._current_dir_str
+        dir_mtime = os.stat(path).st_mtime_ns
+        cached = self._listing_cache.get(self.current_dir)
+        if cached is not None:
+            if path == self._watch_path:
+                # Events are delivered asynchronously; the listing is only
+                # current if no entry changed after the latest queued event.
+                # Read that mtime before draining so its event is included.
+                seen_mtime = self._fs_events.dir_mtime
+                fresh = (self._apply_fs_events(cached[1])
+                         and dir_mtime in (cached[0], seen_mtime))
+            else:
+                fresh = cached[0] == dir_mtime
+                if fresh:
+                    self._watch_directory(path)
+                    
+            if fresh:
+                self._listing_cache[self.current_dir] = (dir_mtime, cached[1])
+                self._listing_cache.move_to_end(self.current_dir)
+                self._raw_entries = cached[1]
+                return
                 
-            # Apply filter pattern if any
-            if self.filter_pattern:
-                entries = [e for e in entries if self.filter_pattern.lower() in e.name.lower()]
+        # Watch before listing so no change slips in between
+        self._watch_directory(path)
+        
+        entries = DirEntries(has_stats=False)
+        
+        # Sizes and times are only needed to sort by them
+        need_stats = self.sort_by in ("size", "modified")
+        dir_entries = [] if need_stats else None
+        
+        # Single scandir pass streaming straight into the field columns.
+        # The file type comes from the directory entry's d_type with no
+        # syscall; only symlinks are stat'ed, so links to directories can
+        # still be opened like directories.
+        add_path = entries.paths.append
+        add_name = entries.names.append
+        add_lower = entries.name_lowers.append
+        add_suffix = entries.suffixes.append
+        add_hidden = entries.is_hidden.append
+        add_dir = entries.is_dirs.append
+        splitext = os.path.splitext
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                lower = name.lower()
+                add_path(entry.path)
+                add_name(name)
+                add_lower(lower)
+                add_suffix(splitext(lower)[1])
+                add_hidden(name[0] == '.')
+                add_dir(entry.is_dir())
+                if dir_entries is not None:
+                    dir_entries.append(entry)
+                    
+        # Zero placeholders for sizes and times, allocated in one go
+        count = len(entries.names)
+        entries.sizes = array('q', bytes(8 * count))
+        entries.mtimes = array('d', bytes(8 * count))
+        
+        if need_stats:
+            # DirEntry.stat reuses data already returned by the listing where it can
+            self._load_stats(entries, dir_entries)
+            
+        self._raw_entries = entries
+        self._listing_cache[self.current_dir] = (dir_mtime, entries)
+        if len(self._listing_cache) > self.LISTING_CACHE_SIZE:
+            self._listing_cache.popitem(last=False)
+    
+    def _load_stats(self, entries: DirEntries, dir_entries: Optional[List[os.DirEntry]] = None):
+        """Fill in sizes and times of a listing read without stat().
+        
+        Args:
+            entries: Listing to update in place
+            dir_entries: Optional DirEntry objects matching the listing
+        """
+        if dir_entries is not None:
+            results = self._stat_many(dir_entries, os.DirEntry.stat)
+        else:
+            results = self._stat_many(entries.paths, os.stat)
+            
+        sizes = entries.sizes
+        mtimes = entries.mtimes
+        for i, st in enumerate(results):
+            # Keep placeholders for entries we can't access
+            if st is not None:
+                sizes[i] = st.st_size if stat.S_ISREG(st.st_mode) else 0
+                mtimes[i] = st.st_mtime
                 
-            # Sort entries
-            if self.sort_by == "name":
-                entries.sort(key=lambda e: e.name.lower(), reverse=self.reverse_sort)
-            elif self.sort_by == "type":
-                entries.sort(key=lambda e: (not e.is_dir(), e.suffix.lower(), e.name.lower()), reverse=self.reverse_sort)
-            elif self.sort_by == "size":
-                entries.sort(key=lambda e: e.stat().st_size if e.is_file() else 0, reverse=self.reverse_sort)
-            elif self.sort_by == "modified":
-                entries.sort(key=lambda e: e.stat().st_mtime, reverse=self.reverse_sort)
+        entries.has_stats = True
+    
+    def _stat_many(self, items: list, stat_func: Callable) -> List[Optional[os.stat_result]]:
+        """Stat a batch of entries, in parallel threads when stat() is slow.
+        
+        The first entries are stat'ed serially; if they average more than
+        SLOW_STAT_SECONDS (network or spun-down disks), the rest are
+        spread over a thread pool since stat() releases the GIL.
+        
+        Args:
+            items: Paths or DirEntry objects
+            stat_func: Function returning the stat result of an item
+            
+        Returns:
+            List[Optional[os.stat_result]]: Stat results, None where stat() failed
+        """
+        def try_stat(item):
+            try:
+                return stat_func(item)
+            except OSError:
+                return None
                 
-            # Add parent directory entry if not at root
-            if self.current_dir.parent != self.current_dir:
-                self.files.append({
-                    "path": self.current_dir.parent,
-                    "name": "..",
-                    "is_dir": True,
-                    "size": 0,
-                    "modified": 0
-                })
+        results = []
+        start = time.perf_counter()
+        for item in items[:self.STAT_PROBE_COUNT]:
+            results.append(try_stat(item))
+            
+        rest = items[self.STAT_PROBE_COUNT:]
+        if rest:
+            elapsed = time.perf_counter() - start
+            if elapsed / len(results) > self.SLOW_STAT_SECONDS:
+                with ThreadPoolExecutor(max_workers=self.STAT_WORKERS) as executor:
+                    results.extend(executor.map(try_stat, rest))
+            else:
+                results.extend(try_stat(item) for item in rest)
                 
-            # Add entries
-            for entry in entries:
-                try:
-                    stat = entry.stat()
-                    self.files.append({
-                        "path": entry,
-                        "name": entry.name,
-                        "is_dir": entry.is_dir(),
-                        "size": stat.st_size if entry.is_file() else 0,
-                        "modified": stat.st_mtime
-                    })
-                except (PermissionError, FileNotFoundError):
-                    # Skip files we can't access
-                    pass
-                    
-            # Reset selection if needed
-            if self.selected_idx >= len(self.files):
-                self.selected_idx = max(0, len(self.files) - 1)
+        return results
+    
+    def _watch_directory(self, path: str):
+        """Move the filesystem watch to a directory.
+        
+        Args:
+            path: Directory to watch
+        """
+        if not HAS_WATCHDOG:
+            return
+            
+        try:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            if self._watch is not None:
+                self._observer.unschedule(self._watch)
+                self._watch = None
+                self._watch_path = None
                 
-            self.set_status(f"Loaded {len(self.files)} items")
+            self._fs_events = DirEventQueue(path, self.MAX_PENDING_EVENTS)
+            self._watch = self._observer.schedule(self._fs_events, path, recursive=False)
+            self._watch_path = path
+        except Exception:
+            # Unwatchable directories fall back to the mtime check
+            pass
+    
+    def _stop_watching(self):
+        """Stop the filesystem observer."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+            self._watch = None
+            self._watch_path = None
+    
+    def _apply_fs_events(self, entries: DirEntries) -> bool:
+        """Apply pending events of the watched directory to its listing.
+        
+        Creations are appended, deletions removed and renames within the
+        directory replace the old entry. Events are idempotent, so changes
+        the listing already contains are harmless.
+        
+        Args:
+            entries: Cached listing of the watched directory
             
-        except PermissionError:
-            self.set_status("Permission denied")
-            self._go_parent()
-        except Exception as e:
-            self.set_status(f"Error: {e}")
+        Returns:
+            bool: False if events were dropped and the listing must be rescanned
+        """
+        events = self._fs_events
+        if events.overflowed:
+            return False
+            
+        path = self._watch_path
+        dirname = os.path.dirname
+        while True:
+            try:
+                event_type, src, dest = events.events.get_nowait()
+            except queue.Empty:
+                return True
+                
+            if event_type in ("deleted", "moved") and dirname(src) == path:
+                self._remove_entry(entries, os.path.basename(src))
+            if event_type == "created" and dirname(src) == path:
+                self._add_entry(entries, src)
+            elif event_type == "moved" and dirname(dest) == path:
+                self._add_entry(entries, dest)
+            elif event_type == "modified" and entries.has_stats and dirname(src) == path:
+                # Contents changed; only sizes and times need updating
+                self._add_entry(entries, src)
+    
+    def _add_entry(self, entries: DirEntries, path: str) -> Optional[int]:
+        """Add an entry to a listing, replacing any entry of the same name.
+        
+        Args:
+            entries: Listing to update in place
+            path: Path of the entry
+            
+        Returns:
+            Optional[int]: Position of the entry, None if it no longer exists
+        """
+        name = os.path.basename(path)
+        index = self._remove_entry(entries, name)
+        if index is None:
+            index = len(entries)
+            
+        try:
+            st = os.stat(path)
+        except OSError:
+            # Broken symlinks are listed like scandir does; vanished entries are not
+            try:
+                st = os.lstat(path)
+            except OSError:
+                return None
+                
+        size = 0
+        mtime = 0.0
+        if entries.has_stats:
+            size = st.st_size if stat.S_ISREG(st.st_mode) else 0
+            mtime = st.st_mtime
+            
+        entries.insert(index, path, name, stat.S_ISDIR(st.st_mode), size, mtime)
+        return index
+    
+    def _remove_entry(self, entries: DirEntries, name: str) -> Optional[int]:
+        """Remove an entry from a listing by name.
+        
+        Args:
+            entries: Listing to update in place
+            name: Entry name
+            
+        Returns:
+            Optional[int]: Former position of the entry, None if not listed
+        """
+        try:
+            index = entries.names.index(name)
+        except ValueError:
+            return None
+        entries.remove(index)
+        return index
+    
+    def _invalidate_listing(self):
+        """Forget the cached listing of the current directory."""
+        self._listing_cache.pop(self.current_dir, None)
+    
+    def _apply_view(self):
+        """Build the displayed file list from the raw entries.
+        
+        Applies the hidden-file setting, filter pattern and sort order
+        in memory, so view toggles never touch the filesystem.
+        """
+        if not self.visible:
+            self._dirty = True
+            return
+            
+        # Lowercase the pattern once; entries carry their lowercased names
+        pattern = self.filter_pattern.lower()
+        show_hidden = self.show_hidden
+        raw = self._raw_entries
+        name_lowers = raw.name_lowers
+        is_hidden = raw.is_hidden
+        
+        # Filter hidden files and apply filter pattern in a single pass
+        if pattern:
+            order = [i for i, lower in enumerate(name_lowers)
+                     if (show_hidden or not is_hidden[i]) and pattern in lower]
+        elif not show_hidden:
+            if HAS_NUMPY and len(raw) >= self.NUMPY_FILTER_MIN:
+                # The hidden flags are a byte mask numpy can read in place
+                order = np.flatnonzero(np.frombuffer(is_hidden, dtype=np.uint8) == 0).tolist()
+            else:
+                order = [i for i, hidden in enumerate(is_hidden) if not hidden]
+        else:
+            order = list(range(len(raw)))
+            
+        # Sort entry indices on the field columns
+        if self.sort_by in ("size", "modified"):
+            if not raw.has_stats:
+                self._load_stats(raw)
+                
+            column = raw.sizes if self.sort_by == "size" else raw.mtimes
+            if HAS_NUMPY and len(order) >= self.NUMPY_SORT_MIN:
+                # Stable argsort straight over the column buffer; negating the
+                # keys keeps ties in listing order like sort(reverse=True)
+                idx = np.array(order, dtype=np.intp)
+                keys = np.frombuffer(column, dtype=np.int64 if column.typecode == 'q' else np.float64)[idx]
+                if self.reverse_sort:
+                    keys = -keys
+                order = idx[np.argsort(keys, kind='stable')].tolist()
+            else:
+                order.sort(key=column.__getitem__, reverse=self.reverse_sort)
+        else:
+            order.sort(key=self._sort_key(raw), reverse=self.reverse_sort)
+            
+        entries = raw.take(order)
+        
+        # Add parent directory entry if not at root
+        if not self._at_root:
+            entries.insert(0, os.path.dirname(self._current_dir_str), "..", True, 0, 0)
+            
+        self.entries = entries
+        self._name_to_idx = None
+        
+        # Display strings are formatted when a row is first drawn, so
+        # huge listings only pay for the rows that come into view
+        self._row_strs = [None] * len(entries)
+        self._detail_strs = [None] * len(entries)
+        self._show_details = self.sort_by in ("size", "modified")
+        
+        # Reset selection if needed
+        if self.selected_idx >= len(self.entries):
+            self.selected_idx = max(0, len(self.entries) - 1)
+    
+    def _sort_key(self, entries: DirEntries) -> Callable[[int], Any]:
+        """Get the key function of the active sort order.
+        
+        Args:
+            entries: Entries the key indexes into
+            
+        Returns:
+            Callable[[int], Any]: Function mapping an entry index to its sort key
+        """
+        if self.sort_by == "type":
+            # Build the key tuples in one pass over the columns, so sorting
+            # looks them up with a C-level getter instead of a lambda
+            keys = [(not is_dir, suffix, lower) for is_dir, suffix, lower
+                    in zip(entries.is_dirs, entries.suffixes, entries.name_lowers)]
+            return keys.__getitem__
+        if self.sort_by == "size":
+            return entries.sizes.__getitem__
+        if self.sort_by == "modified":
+            return entries.mtimes.__getitem__
+        return entries.name_lowers.__getitem__
+    
+    def _insert_entry(self, path: Path):
+        """Add a new entry of the current directory without rescanning it.
+        
+        Only the new path is stat'ed. It is added to the cached listing and
+        placed in the displayed list at its sorted position, then selected.
+        
+        Args:
+            path: Path of the new entry
+        """
+        if path.parent != self.current_dir:
+            self._invalidate_listing()
+            self._load_directory()
+            self._select_name(path.name)
+            return
+            
+        raw = self._raw_entries
+        name = path.name
+        index = self._add_entry(raw, os.fspath(path))
+        if self.current_dir in self._listing_cache:
+            self._listing_cache[self.current_dir] = (os.stat(self.current_dir).st_mtime_ns, raw)
+            
+        # Drop a replaced entry of the same name from the view
+        entries = self.entries
+        self._remove_shown(name)
+        
+        pattern = self.filter_pattern.lower()
+        if (index is None or (raw.is_hidden[index] and not self.show_hidden)
+                or (pattern and pattern not in raw.name_lowers[index])):
+            self.selected_idx = min(self.selected_idx, max(0, len(entries) - 1))
+            return
+            
+        # Binary search for the slot after entries with equal keys, matching
+        # where a stable sort would place an entry appended to the listing
+        key = self._sort_key(raw)(index)
+        entry_key = self._sort_key(entries)
+        reverse = self.reverse_sort
+        lo = 0 if self._at_root else 1
+        hi = len(entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = entry_key(mid)
+            if (mid_key < key) if reverse else (key < mid_key):
+                hi = mid
+            else:
+                lo = mid + 1
+                
+        entries.insert(lo, raw.paths[index], name, raw.is_dirs[index], raw.sizes[index], raw.mtimes[index])
+        self._row_strs.insert(lo, None)
+        self._detail_strs.insert(lo, None)
+        self._name_to_idx = None
+        self.selected_idx = lo
+        self._ensure_selection_visible()
+    
+    def _remove_shown(self, name: str):
+        """Remove an entry from the displayed list by name.
+        
+        Args:
+            name: Entry name
+        """
+        index = self._shown_index(name)
+        if index is not None:
+            self.entries.remove(index)
+            del self._row_strs[index]
+            del self._detail_strs[index]
+            self._name_to_idx = None
+    
+    def _shown_index(self, name: str) -> Optional[int]:
+        """Get the position of a name in the displayed list.
+        
+        Args:
+            name: Entry name
+            
+        Returns:
+            Optional[int]: Index of the entry, None if not displayed
+        """
+        if self._name_to_idx is None:
+            self._name_to_idx = {item_name: i for i, item_name in enumerate(self.entries.names)}
+        return self._name_to_idx.get(name)
+    
+    def _select_name(self, name: str):
+        """Select the displayed entry with the given name, if any.
+        
+        Args:
+            name: Entry name
+        """
+        index = self._shown_index(name)
+        if index is not None:
+            self.selected_idx = index
+            self._ensure_selection_visible()
     
     def _move_up(self):
         """Move selection up."""
-        if self.files:
-            self.selected_idx = (self.selected_idx - 1) % len(self.files)
+        if self.entries:
+            self.selected_idx = (self.selected_idx - 1) % len(self.entries)
             self._ensure_selection_visible()
     
     def _move_down(self):
         """Move selection down."""
-        if self.files:
-            self.selected_idx = (self.selected_idx + 1) % len(self.files)
+        if self.entries:
+            self.selected_idx = (self.selected_idx + 1) % len(self.entries)
             self._ensure_selection_visible()
     
     def _page_up(self):
         """Move up one page."""
-        if self.files:
+        if self.entries:
             page_size = self.height - 3
             self.selected_idx = max(0, self.selected_idx - page_size)
             self._ensure_selection_visible()
     
     def _page_down(self):
         """Move down one page."""
-        if self.files:
+        if self.entries:
             page_size = self.height - 3
-            self.selected_idx = min(len(self.files) - 1, self.selected_idx + page_size)
+            self.selected_idx = min(len(self.entries) - 1, self.selected_idx + page_size)
             self._ensure_selection_visible()
     
     def _goto_top(self):
         """Go to first item."""
-        if self.files:
+        if self.entries:
             self.selected_idx = 0
             self._ensure_selection_visible()
     
     def _goto_bottom(self):
         """Go to last item."""
-        if self.files:
-            self.selected_idx = len(self.files) - 1
+        if self.entries:
+            self.selected_idx = len(self.entries) - 1
             self._ensure_selection_visible()
     
     def _ensure_selection_visible(self):
         """Ensure selected item is visible."""
-        if not self.files:
+        if not self.entries:
             return
             
         # Adjust scroll position if needed
@@ -183,39 +787,39 @@ class FileBrowser(EditorComponent):
     
     def _go_parent(self):
         """Go to parent directory."""
-        if self.current_dir.parent != self.current_dir:
+        if not self._at_root:
             self.current_dir = self.current_dir.parent
             self._load_directory()
     
     def _open_selected(self):
         """Open selected file or directory."""
-        if not self.files:
+        if not self.entries:
             return
             
-        selected = self.files[self.selected_idx]
+        path = self.entries.paths[self.selected_idx]
         
-        if selected["is_dir"]:
+        if self.entries.is_dirs[self.selected_idx]:
             # Navigate to directory
-            self.current_dir = selected["path"]
+            self.current_dir = Path(path)
             self.selected_idx = 0
             self.scroll_pos = 0
             self._load_directory()
         elif self.file_open_callback:
             # Call file open callback
-            self.file_open_callback(selected["path"])
+            self.file_open_callback(Path(path))
             return False
     
     def _toggle_hidden(self):
         """Toggle display of hidden files."""
         self.show_hidden = not self.show_hidden
-        self._load_directory()
+        self._apply_view()
         self.set_status(f"Hidden files {'shown' if self.show_hidden else 'hidden'}")
     
     def _filter_files(self):
         """Filter files by pattern."""
         pattern = self._get_input("Filter: ")
         self.filter_pattern = pattern
-        self._load_directory()
+        self._apply_view()
         if pattern:
             self.set_status(f"Filtered by '{pattern}'")
         else:
@@ -233,11 +837,13 @@ class FileBrowser(EditorComponent):
         else:
             self.reverse_sort = True
             
-        self._load_directory()
+        self._apply_view()
         self.set_status(f"Sorted by {self.sort_by} {'descending' if self.reverse_sort else 'ascending'}")
     
     def _refresh(self):
         """Refresh directory listing."""
+        # File sizes and times can change without touching the directory mtime
+        self._invalidate_listing()
         self._load_directory()
         self.set_status("Refreshed")
     
@@ -265,46 +871,41 @@ class FileBrowser(EditorComponent):
                 path.mkdir()
                 self.set_status(f"Created directory: {name}")
                 
-            self._load_directory()
-            
-            # Select new item
-            for i, item in enumerate(self.files):
-                if item["name"] == name:
-                    self.selected_idx = i
-                    self._ensure_selection_visible()
-                    break
+            # Add and select new item
+            self._insert_entry(path)
                     
         except Exception as e:
             self.set_status(f"Error: {e}")
     
     def _delete_file(self):
         """Delete selected file or directory."""
-        if not self.files:
+        if not self.entries:
             return
             
-        selected = self.files[self.selected_idx]
+        name = self.entries.names[self.selected_idx]
         
         # Don't allow deleting parent directory
-        if selected["name"] == "..":
+        if name == "..":
             self.set_status("Cannot delete parent directory")
             return
             
-        confirm = self._get_input(f"Delete {selected['name']}? (y/N): ")
+        confirm = self._get_input(f"Delete {name}? (y/N): ")
         if confirm.lower() != 'y':
             self.set_status("Cancelled")
             return
             
         try:
-            path = selected["path"]
+            path = self.entries.paths[self.selected_idx]
             
-            if selected["is_dir"]:
+            if self.entries.is_dirs[self.selected_idx]:
                 # Delete directory
                 shutil.rmtree(path)
             else:
                 # Delete file
-                path.unlink()
+                os.unlink(path)
                 
-            self.set_status(f"Deleted: {selected['name']}")
+            self.set_status(f"Deleted: {name}")
+            self._invalidate_listing()
             self._load_directory()
             
         except Exception as e:
@@ -312,72 +913,69 @@ class FileBrowser(EditorComponent):
     
     def _rename_file(self):
         """Rename selected file or directory."""
-        if not self.files:
+        if not self.entries:
             return
             
-        selected = self.files[self.selected_idx]
+        name = self.entries.names[self.selected_idx]
         
         # Don't allow renaming parent directory
-        if selected["name"] == "..":
+        if name == "..":
             self.set_status("Cannot rename parent directory")
             return
             
-        new_name = self._get_input(f"Rename to: ", selected["name"])
-        if not new_name or new_name == selected["name"]:
+        new_name = self._get_input(f"Rename to: ", name)
+        if not new_name or new_name == name:
             self.set_status("Cancelled")
             return
             
         try:
-            old_path = selected["path"]
+            old_path = Path(self.entries.paths[self.selected_idx])
             new_path = old_path.parent / new_name
             
             # Rename file or directory
             old_path.rename(new_path)
             
             self.set_status(f"Renamed to: {new_name}")
-            self._load_directory()
+            self._remove_entry(self._raw_entries, name)
+            self._remove_shown(name)
             
-            # Select renamed item
-            for i, item in enumerate(self.files):
-                if item["name"] == new_name:
-                    self.selected_idx = i
-                    self._ensure_selection_visible()
-                    break
+            # Add and select renamed item
+            self._insert_entry(new_path)
                     
         except Exception as e:
             self.set_status(f"Error: {e}")
     
     def _copy_file(self):
         """Copy selected file or directory to clipboard."""
-        if not self.files:
+        if not self.entries:
             return
             
-        selected = self.files[self.selected_idx]
+        name = self.entries.names[self.selected_idx]
         
         # Don't allow copying parent directory
-        if selected["name"] == "..":
+        if name == "..":
             self.set_status("Cannot copy parent directory")
             return
             
-        self.clipboard = selected["path"]
+        self.clipboard = Path(self.entries.paths[self.selected_idx])
         self.clipboard_op = "copy"
-        self.set_status(f"Copied: {selected['name']}")
+        self.set_status(f"Copied: {name}")
     
     def _cut_file(self):
         """Cut selected file or directory to clipboard."""
-        if not self.files:
+        if not self.entries:
             return
             
-        selected = self.files[self.selected_idx]
+        name = self.entries.names[self.selected_idx]
         
         # Don't allow cutting parent directory
-        if selected["name"] == "..":
+        if name == "..":
             self.set_status("Cannot cut parent directory")
             return
             
-        self.clipboard = selected["path"]
+        self.clipboard = Path(self.entries.paths[self.selected_idx])
         self.clipboard_op = "cut"
-        self.set_status(f"Cut: {selected['name']}")
+        self.set_status(f"Cut: {name}")
     
     def _paste_file(self):
         """Paste file or directory from clipboard."""
@@ -406,18 +1004,13 @@ class FileBrowser(EditorComponent):
                 self.set_status(f"Copied: {src_path.name}")
             else:  # cut
                 shutil.move(src_path, dst_path)
+                self._listing_cache.pop(src_path.parent, None)
                 self.set_status(f"Moved: {src_path.name}")
                 self.clipboard = None
                 self.clipboard_op = None
                 
-            self._load_directory()
-            
-            # Select pasted item
-            for i, item in enumerate(self.files):
-                if item["name"] == src_path.name:
-                    self.selected_idx = i
-                    self._ensure_selection_visible()
-                    break
+            # Add and select pasted item
+            self._insert_entry(dst_path)
                     
         except Exception as e:
             self.set_status(f"Error: {e}")
@@ -429,14 +1022,14 @@ class FileBrowser(EditorComponent):
             self.set_status("Cancelled")
             return
             
-        # Set filter and reload
+        # Set filter and rebuild the view
         self.filter_pattern = pattern
-        self._load_directory()
+        self._apply_view()
         
-        if self.files:
+        if self.entries:
             self.selected_idx = 0
             self._ensure_selection_visible()
-            self.set_status(f"Found {len(self.files)} matches for '{pattern}'")
+            self.set_status(f"Found {len(self.entries)} matches for '{pattern}'")
         else:
             self.set_status(f"No matches for '{pattern}'")
     
@@ -513,9 +1106,10 @@ class FileBrowser(EditorComponent):
         if default:
             self.stdscr.addstr(self.height - 1, len(prompt), default)
             
-        # Get input
-        input_str = default
-        self.stdscr.move(self.height - 1, len(prompt) + len(input_str))
+        # Get input as UTF-8 bytes; curses delivers multi-byte characters
+        # one byte at a time
+        buf = bytearray(default.encode('utf-8'))
+        self.stdscr.move(self.height - 1, len(prompt) + len(default))
         
         while True:
             try:
@@ -523,16 +1117,18 @@ class FileBrowser(EditorComponent):
                 if ch == 10:  # Enter
                     break
                 elif ch == 27:  # Escape
-                    input_str = ""
+                    buf.clear()
                     break
                 elif ch == curses.KEY_BACKSPACE or ch == 127:  # Backspace
-                    if input_str:
-                        input_str = input_str[:-1]
+                    if buf:
+                        # Drop the last character along with its continuation bytes
+                        while buf and buf.pop() & 0xC0 == 0x80:
+                            pass
                         self.stdscr.move(self.height - 1, len(prompt))
                         self.stdscr.clrtoeol()
-                        self.stdscr.addstr(self.height - 1, len(prompt), input_str)
-                else:
-                    input_str += chr(ch)
+                        self.stdscr.addstr(self.height - 1, len(prompt), buf.decode('utf-8', errors='replace'))
+                elif ch < 256:
+                    buf.append(ch)
             except:
                 break
                 
@@ -540,7 +1136,7 @@ class FileBrowser(EditorComponent):
         curses.noecho()
         curses.curs_set(0)
         
-        return input_str
+        return buf.decode('utf-8', errors='replace')
     
     def _quit(self):
         """Quit browser."""
@@ -563,54 +1159,94 @@ class FileBrowser(EditorComponent):
                 
         return True
     
-    def get_visible_content(self) -> List[Tuple[int, Dict[str, Any]]]:
+    def get_visible_content(self) -> List[Tuple[int, str, bool]]:
         """Get content visible in the current view.
         
         Returns:
-            List of (index, file_info) tuples
+            List of (index, name, is_dir) tuples
         """
         max_lines = self.height - 2  # Account for title and status bars
         start_line = self.scroll_pos
-        end_line = min(start_line + max_lines, len(self.files))
+        end_line = min(start_line + max_lines, len(self.entries))
         
-        return [(i, self.files[i]) for i in range(start_line, end_line)]
+        return list(zip(
+            range(start_line, end_line),
+            self.entries.names[start_line:end_line],
+            self.entries.is_dirs[start_line:end_line]
+        ))
     
     def draw_title_bar(self):
         """Draw title bar with current directory."""
         title = f" {self.current_dir}"
         
         # Fill with spaces
-        padding = " " * (self.width - len(title) - 1)
+        padding = self._blank[:max(0, self.width - len(title) - 1)]
         
-        try:
-            self.stdscr.addstr(0, 0, title, self.colors["title"])
-            self.stdscr.addstr(0, len(title), padding)
-        except curses.error:
-            pass
+        self._set_line(0, ((0, title, self.colors["title"]), (len(title), padding, 0)))
     
     def draw(self):
         """Draw browser content."""
-        # Get visible content
-        visible_content = self.get_visible_content()
+        # Visible range, read straight from the entry columns
+        start = self.scroll_pos
+        end = min(start + self.height - 2, len(self.entries))  # Account for title and status bars
+        names = self.entries.names
+        is_dirs = self.entries.is_dirs
+        row_strs = self._row_strs
+        selected_idx = self.selected_idx
+        set_line = self._set_line
+        
+        # Resolve row attributes once per frame; the selection bar is the
+        # cached blank row, clipped to the window when written
+        colors = self.colors
+        dir_attr = colors["directory"]
+        file_attr = colors["normal"]
+        bar = (0, self._blank, colors["selected"])
+        
+        # Size and time column; the parent entry has none
+        details = self._detail_strs if self._show_details else None
+        first = 0 if self._at_root else 1
+        width = self.width
         
         # Draw content
-        for i, (idx, file_info) in enumerate(visible_content):
-            y = i + 1  # +1 for title bar
+        for y, idx in enumerate(range(start, end), 1):  # +1 for title bar
+            is_dir = is_dirs[idx]
             
-            # Format file info
-            if file_info["is_dir"]:
-                name = f"📁 {file_info['name']}/"
-                color = self.colors["normal"] | curses.A_BOLD | curses.color_pair(1)  # Cyan for directories
-            else:
-                name = f"📄 {file_info['name']}"
-                color = self.colors["normal"]
+            # Format file info once per view
+            row = row_strs[idx]
+            if row is None:
+                row = row_strs[idx] = f"📁 {names[idx]}/" if is_dir else f"📄 {names[idx]}"
                 
+            attr = (colors["directory_selected" if is_dir else "file_selected"] if idx == selected_idx
+                    else dir_attr if is_dir else file_attr)
+            segments = [(1, row, attr)]
+            
+            if details is not None and idx >= first:
+                detail = details[idx]
+                if detail is None:
+                    detail = details[idx] = self._format_detail(idx)
+                    
+                # Right-aligned, only where it clears the (double-width) icon and name
+                x = width - len(detail) - 2
+                if x > len(row) + 2:
+                    segments.append((x, detail, attr))
+                    
             # Highlight selected item
-            if idx == self.selected_idx:
-                self.stdscr.addstr(y, 0, " " * (self.width - 1), curses.A_REVERSE)
-                self.stdscr.addstr(y, 1, name, color | curses.A_REVERSE)
-            else:
-                self.stdscr.addstr(y, 1, name, color)
+            if idx == selected_idx:
+                segments.insert(0, bar)
+            set_line(y, segments)
+    
+    def _format_detail(self, idx: int) -> str:
+        """Format the size and time column of a displayed entry.
+        
+        Args:
+            idx: Entry index
+            
+        Returns:
+            str: Size (blank for directories) and modification time
+        """
+        entries = self.entries
+        size = "" if entries.is_dirs[idx] else _format_size(entries.sizes[idx])
+        return f"{size:>10}  {_format_mtime(int(entries.mtimes[idx]) // 60)}"
     
     def set_file_open_callback(self, callback: Callable[[Path], None]):
         """Set callback for file open action.
@@ -636,4 +1272,31 @@ class FileBrowser(EditorComponent):
         self.set_file_open_callback(file_selected)
         self.run()
         
-        return selected_file
\ No newline at end of file
+        return selected_file
+    
+    def set_visible(self, visible: bool):
+        """Set whether the browser is shown.
+        
+        While hidden, directory loads and view rebuilds are skipped; the
+        latest state is loaded once the browser is shown again.
+        
+        Args:
+            visible: True if the browser is on screen
+        """
+        self.visible = visible
+        if visible and self._dirty:
+            self._dirty = False
+            self._load_directory()
+    
+    def run(self) -> Optional[Any]:
+        """Run browser main loop, hiding it and stopping the filesystem watch on exit.
+        
+        Returns:
+            Optional[Any]: Result of browser operation
+        """
+        self.set_visible(True)
+        try:
+            return super().run()
+        finally:
+            self._stop_watching()
+            self.set_visible(False)
\ No newline at end of file
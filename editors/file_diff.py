@@ -3,14 +3,27 @@
 """File diff component for comparing files."""
 import curses
 import os
-import difflib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
-from editors.editor_base import EditorComponent
+from editors.editor_base import EditorComponent, _line_number
+from editors.line_buffer import LineBuffer
+from editors import diff_engine
 
 class FileDiff(EditorComponent):
     """File diff component for comparing files."""
     
+    # Number of generated diffs kept for format and context toggles
+    DIFF_CACHE_SIZE = 8
+    
+    # First characters of changed lines; ndiff '?' marker lines are not changes
+    CHANGE_MARKERS = frozenset("+-")
+    
+    # Threads used by run_many when the diff kernel releases the GIL
+    DIFF_WORKERS = os.cpu_count() or 1
+    
     def __init__(self, stdscr, filepath: Optional[Path] = None, compare_path: Optional[Path] = None):
         """Initialize file diff component.
         
@@ -21,6 +34,22 @@ class FileDiff(EditorComponent):
         """
         super().__init__(stdscr, filepath)
         
+        # Diff marker colors
+        self.colors.update({
+            "added": self.colors["normal"] | curses.A_BOLD | curses.color_pair(2),  # Green for additions
+            "removed": self.colors["normal"] | curses.A_BOLD | curses.color_pair(3),  # Yellow for deletions
+            "marker": self.colors["normal"] | curses.A_BOLD | curses.color_pair(4),  # Red for ndiff markers
+            "hunk": self.colors["normal"] | curses.A_BOLD | curses.color_pair(1),  # Cyan for unified diff headers
+        })
+        
+        # Line color by first character of a diff line
+        self._marker_colors = {
+            '+': self.colors["added"],
+            '-': self.colors["removed"],
+            '?': self.colors["marker"],
+            '@': self.colors["hunk"],
+        }
+        
         # Diff state
         self.compare_path = compare_path
         self.diff_lines = []
@@ -28,6 +57,10 @@ class FileDiff(EditorComponent):
         self.unified_diff = True
         self.context_lines = 3
         
+        # Diff lines and positions by file states and format; emptied by
+        # load_file, which the base initializer has already called
+        self._diff_cache: "OrderedDict[tuple, Tuple[List[str], List[int]]]" = OrderedDict()
+        
         # Load comparison file if provided
         if self.compare_path and self.compare_path.exists():
             self._load_comparison()
@@ -51,11 +84,20 @@ class FileDiff(EditorComponent):
         if self.filepath and self.compare_path:
             self._generate_diff()
     
+    def load_file(self) -> bool:
+        """Load file content, forgetting diffs of the previous content.
+        
+        Returns:
+            bool: True if file was loaded successfully
+        """
+        self._diff_cache = OrderedDict()
+        return super().load_file()
+    
     def _load_comparison(self):
         """Load comparison file."""
         try:
-            with open(self.compare_path, 'r', encoding='utf-8') as f:
-                self.compare_content = f.read().splitlines()
+            # Index line offsets only; lines are decoded when the diff needs them
+            self.compare_content = LineBuffer.from_file(self.compare_path)
             self.set_status(f"Loaded comparison file: {self.compare_path.name}")
         except Exception as e:
             self.set_status(f"Error loading comparison file: {e}")
@@ -66,32 +108,38 @@ class FileDiff(EditorComponent):
         if not self.content or not hasattr(self, 'compare_content'):
             return
             
+        # Reuse the diff while neither file changed on disk
+        try:
+            key = (self.filepath, os.stat(self.filepath).st_mtime_ns,
+                   self.compare_path, os.stat(self.compare_path).st_mtime_ns,
+                   self.unified_diff, self.context_lines)
+        except OSError:
+            key = None
+        cached = self._diff_cache.get(key) if key is not None else None
+        if cached is not None:
+            self._diff_cache.move_to_end(key)
+            self.diff_lines, self.diff_positions = cached
+            self.set_status(f"Found {len(self.diff_positions)} differences")
+            return
+            
         # Clear previous diff
         self.diff_lines = []
         self.diff_positions = []
         
-        # Generate diff
-        if self.unified_diff:
-            diff = list(difflib.unified_diff(
-                self.content,
-                self.compare_content,
-                fromfile=str(self.filepath),
-                tofile=str(self.compare_path),
-                n=self.context_lines,
-                lineterm=''
-            ))
-        else:
-            diff = list(difflib.ndiff(self.content, self.compare_content))
+        # Generate diff; both formats share the Myers line engine
+        diff = self._format_diff(list(self.content), list(self.compare_content), self.filepath, self.compare_path)
             
         # Store diff lines
         self.diff_lines = diff
         
-        # Find positions of actual differences
-        for i, line in enumerate(diff):
-            if line.startswith('+') or line.startswith('-') or line.startswith('?'):
-                if line.startswith('?'):
-                    continue  # Skip ndiff marker lines
-                self.diff_positions.append(i)
+        # Find positions of actual differences with one set lookup per line
+        markers = self.CHANGE_MARKERS
+        self.diff_positions = [i for i, line in enumerate(diff) if line[:1] in markers]
+                
+        if key is not None:
+            self._diff_cache[key] = (self.diff_lines, self.diff_positions)
+            if len(self._diff_cache) > self.DIFF_CACHE_SIZE:
+                self._diff_cache.popitem(last=False)
                 
         self.set_status(f"Found {len(self.diff_positions)} differences")
     
@@ -103,29 +151,21 @@ class FileDiff(EditorComponent):
             
         current_line = self.scroll_pos + self.cursor_y
         
-        # Find next diff position after current line
-        next_pos = None
-        for pos in self.diff_positions:
-            if pos > current_line:
-                next_pos = pos
-                break
-                
-        # Wrap around if needed
-        if next_pos is None and self.diff_positions:
-            next_pos = self.diff_positions[0]
+        # Find next diff position after current line, wrapping around
+        idx = bisect_right(self.diff_positions, current_line) % len(self.diff_positions)
+        next_pos = self.diff_positions[idx]
             
-        if next_pos is not None:
-            # Adjust scroll position
-            if next_pos < self.scroll_pos:
-                self.scroll_pos = next_pos
-            elif next_pos >= self.scroll_pos + self.height - 2:
-                self.scroll_pos = next_pos - (self.height - 3)
-                
-            # Set cursor position
-            self.cursor_y = next_pos - self.scroll_pos
-            self.cursor_x = 0
+        # Adjust scroll position
+        if next_pos < self.scroll_pos:
+            self.scroll_pos = next_pos
+        elif next_pos >= self.scroll_pos + self.height - 2:
+            self.scroll_pos = next_pos - (self.height - 3)
             
-            self.set_status(f"Difference {self.diff_positions.index(next_pos) + 1}/{len(self.diff_positions)}")
+        # Set cursor position
+        self.cursor_y = next_pos - self.scroll_pos
+        self.cursor_x = 0
+        
+        self.set_status(f"Difference {idx + 1}/{len(self.diff_positions)}")
     
     def _prev_diff(self):
         """Go to previous difference."""
@@ -135,29 +175,80 @@ class FileDiff(EditorComponent):
             
         current_line = self.scroll_pos + self.cursor_y
         
-        # Find previous diff position before current line
-        prev_pos = None
-        for pos in reversed(self.diff_positions):
-            if pos < current_line:
-                prev_pos = pos
-                break
-                
-        # Wrap around if needed
-        if prev_pos is None and self.diff_positions:
-            prev_pos = self.diff_positions[-1]
+        # Find previous diff position before current line, wrapping around
+        idx = (bisect_left(self.diff_positions, current_line) - 1) % len(self.diff_positions)
+        prev_pos = self.diff_positions[idx]
             
-        if prev_pos is not None:
-            # Adjust scroll position
-            if prev_pos < self.scroll_pos:
-                self.scroll_pos = prev_pos
-            elif prev_pos >= self.scroll_pos + self.height - 2:
-                self.scroll_pos = prev_pos - (self.height - 3)
-                
-            # Set cursor position
-            self.cursor_y = prev_pos - self.scroll_pos
-            self.cursor_x = 0
+        # Adjust scroll position
+        if prev_pos < self.scroll_pos:
+            self.scroll_pos = prev_pos
+        elif prev_pos >= self.scroll_pos + self.height - 2:
+            self.scroll_pos = prev_pos - (self.height - 3)
+            
+        # Set cursor position
+        self.cursor_y = prev_pos - self.scroll_pos
+        self.cursor_x = 0
+        
+        self.set_status(f"Difference {idx + 1}/{len(self.diff_positions)}")
+    
+    def _format_diff(self, content: List[str], compare_content: List[str],
+                     fromfile: Path, tofile: Path) -> List[str]:
+        """Diff two lists of lines in the current format.
+        
+        Args:
+            content: Lines of the first file
+            compare_content: Lines of the second file
+            fromfile: Path of the first file, for the unified header
+            tofile: Path of the second file, for the unified header
             
-            self.set_status(f"Difference {self.diff_positions.index(prev_pos) + 1}/{len(self.diff_positions)}")
+        Returns:
+            List[str]: Diff lines
+        """
+        if self.unified_diff:
+            return diff_engine.unified_diff(
+                content,
+                compare_content,
+                fromfile=str(fromfile),
+                tofile=str(tofile),
+                n=self.context_lines
+            )
+        return diff_engine.ndiff(content, compare_content)
+    
+    def _diff_pair(self, pair: Tuple[Path, Path]) -> List[str]:
+        """Load and diff a pair of files.
+        
+        Args:
+            pair: First and second file
+            
+        Returns:
+            List[str]: Diff lines
+        """
+        file1, file2 = pair
+        return self._format_diff(list(LineBuffer.from_file(file1)), list(LineBuffer.from_file(file2)), file1, file2)
+    
+    def run_many(self, pairs: List[Tuple[Path, Path]]) -> Dict[Tuple[Path, Path], List[str]]:
+        """Diff several pairs of files in the current format.
+        
+        Pairs are diffed in parallel threads when the compiled diff kernel
+        is available, as it runs without holding the GIL; otherwise one
+        after another.
+        
+        Args:
+            pairs: (first file, second file) pairs
+            
+        Returns:
+            Dict[Tuple[Path, Path], List[str]]: Diff lines by pair
+            
+        Raises:
+            OSError: If a file cannot be read
+        """
+        if len(pairs) > 1 and diff_engine.jit_available():
+            with ThreadPoolExecutor(max_workers=min(self.DIFF_WORKERS, len(pairs))) as executor:
+                results = list(executor.map(self._diff_pair, pairs))
+        else:
+            results = [self._diff_pair(pair) for pair in pairs]
+            
+        return dict(zip(pairs, results))
     
     def _toggle_unified_diff(self):
         """Toggle between unified and ndiff formats."""
@@ -243,24 +334,27 @@ class FileDiff(EditorComponent):
         # Show prompt
         self.stdscr.addstr(self.height - 1, 0, prompt)
         
-        # Get input
-        input_str = ""
+        # Get input as UTF-8 bytes; curses delivers multi-byte characters
+        # one byte at a time
+        buf = bytearray()
         while True:
             try:
                 ch = self.stdscr.getch()
                 if ch == 10:  # Enter
                     break
                 elif ch == 27:  # Escape
-                    input_str = ""
+                    buf.clear()
                     break
                 elif ch == curses.KEY_BACKSPACE or ch == 127:  # Backspace
-                    if input_str:
-                        input_str = input_str[:-1]
+                    if buf:
+                        # Drop the last character along with its continuation bytes
+                        while buf and buf.pop() & 0xC0 == 0x80:
+                            pass
                         self.stdscr.move(self.height - 1, len(prompt))
                         self.stdscr.clrtoeol()
-                        self.stdscr.addstr(self.height - 1, len(prompt), input_str)
-                else:
-                    input_str += chr(ch)
+                        self.stdscr.addstr(self.height - 1, len(prompt), buf.decode('utf-8', errors='replace'))
+                elif ch < 256:
+                    buf.append(ch)
             except:
                 break
                 
@@ -268,7 +362,7 @@ class FileDiff(EditorComponent):
         curses.noecho()
         curses.curs_set(0)
         
-        return input_str
+        return buf.decode('utf-8', errors='replace')
     
     def _page_down(self):
         """Move down one page."""
@@ -325,30 +419,26 @@ class FileDiff(EditorComponent):
         # Get visible content
         visible_content = self.get_visible_content()
         
+        marker_color = self._marker_colors.get
+        normal = self.colors["normal"]
+        
         # Draw content
         for i, (line_idx, line) in enumerate(visible_content):
             y = i + 1  # +1 for title bar
+            segments = []
             
             # Draw line number if enabled
             if self.show_line_numbers:
-                line_num = str(line_idx + 1).rjust(line_num_width - 1)
-                self.stdscr.addstr(y, 0, line_num, self.colors["line_number"])
-                self.stdscr.addstr(y, line_num_width - 1, " ")
+                line_num = _line_number(line_idx + 1, line_num_width - 1)
+                # Number and separator go out in a single write
+                segments.append((0, line_num, self.colors["line_number"]))
             
             # Determine line color based on diff marker
-            if line.startswith('+'):
-                color = self.colors["normal"] | curses.A_BOLD | curses.color_pair(2)  # Green for additions
-            elif line.startswith('-'):
-                color = self.colors["normal"] | curses.A_BOLD | curses.color_pair(3)  # Yellow for deletions
-            elif line.startswith('?'):
-                color = self.colors["normal"] | curses.A_BOLD | curses.color_pair(4)  # Red for ndiff markers
-            elif line.startswith('@'):
-                color = self.colors["normal"] | curses.A_BOLD | curses.color_pair(1)  # Cyan for unified diff headers
-            else:
-                color = self.colors["normal"]
+            color = marker_color(line[:1], normal)
                 
             # Draw line
-            self.stdscr.addstr(y, line_num_width, line, color)
+            segments.append((line_num_width, line, color))
+            self._set_line(y, segments)
     
     def set_comparison_file(self, filepath: Path):
         """Set comparison file.
@@ -357,6 +447,7 @@ class FileDiff(EditorComponent):
             filepath: Path to comparison file
         """
         self.compare_path = filepath
+        self._diff_cache = OrderedDict()
         if self.compare_path.exists():
             self._load_comparison()
             if self.filepath:
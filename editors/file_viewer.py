@@ -4,12 +4,21 @@
 import curses
 import os
 import re
+from io import StringIO
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
-from pygments import highlight
-from pygments.lexers import get_lexer_for_filename, TextLexer
+from pygments.lexers import TextLexer
 from pygments.formatters import Terminal256Formatter
-from editors.editor_base import EditorComponent
+from editors.editor_base import EditorComponent, _lexer_for_filename, _line_number
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 class FileViewer(EditorComponent):
     """File viewer with syntax highlighting and search capabilities."""
@@ -27,10 +36,27 @@ class FileViewer(EditorComponent):
         self.search_term = ""
         self.search_results = []
         self.current_search_idx = -1
+        self._search_pattern: Optional[re.Pattern] = None
+        
+        # Buffer and (term, version) the current results were found for
+        self._search_source = None
+        self._search_key: Optional[Tuple[str, int]] = None
         self.show_line_numbers = True
         self.syntax_highlighting = True
         self.wrap_lines = False
         
+        # Content joined into one string for searching, with the start
+        # offset of every line; rebuilt when the content changes
+        self._joined_content = ""
+        self._line_offsets = array('q', [0])
+        self._joined_source = None
+        self._joined_version = -1
+        
+        # Highlighted text of every line, built by lexing the whole file once
+        self._hl_lines: List[str] = []
+        self._hl_source = None
+        self._hl_version = -1
+        
         # Initialize syntax highlighting
         self._init_syntax_highlighting()
         
@@ -63,13 +89,53 @@ class FileViewer(EditorComponent):
         self.lexer = None
         self.formatter = Terminal256Formatter()
         
+        # Keep leading and trailing blank lines so tokens stay aligned with lines
         if self.filepath:
-            try:
-                self.lexer = get_lexer_for_filename(self.filepath.name)
-            except:
-                self.lexer = TextLexer()
+            self.lexer = _lexer_for_filename(self.filepath.name, stripnl=False)
+        if self.lexer is None:
+            self.lexer = TextLexer(stripnl=False)
+        self._hl_lines = []
+        self._hl_source = None
+    
+    def _highlighted_lines(self) -> List[str]:
+        """Get highlighted text of every line, lexing the file when it changed.
+        
+        Returns:
+            List[str]: Highlighted line text, indexed like the content
+        """
+        content = self.content
+        if content is self._hl_source and content.version == self._hl_version:
+            return self._hl_lines
+            
+        text, _ = self._joined_text()
+        if "\r" in text:
+            # Pygments also breaks lines at a bare \r, which lines can keep,
+            # so lexing the joined text would shift every later row
+            line_tokens = [[(ttype, value.replace("\n", "")) for ttype, value in self.lexer.get_tokens(line)]
+                           for line in content]
         else:
-            self.lexer = TextLexer()
+            line_tokens = [[]]
+            for ttype, value in self.lexer.get_tokens(text):
+                # Split multi-line tokens at line boundaries
+                parts = value.split("\n")
+                if parts[0]:
+                    line_tokens[-1].append((ttype, parts[0]))
+                for part in parts[1:]:
+                    line_tokens.append([(ttype, part)] if part else [])
+            # Drop the line opened by the newline the lexer appends
+            del line_tokens[len(content):]
+                
+        lines = []
+        formatter = self.formatter
+        for tokens in line_tokens:
+            out = StringIO()
+            formatter.format(tokens, out)
+            lines.append(out.getvalue())
+            
+        self._hl_lines = lines
+        self._hl_source = content
+        self._hl_version = content.version
+        return lines
     
     def _start_search(self):
         """Start search mode."""
@@ -77,13 +143,29 @@ class FileViewer(EditorComponent):
         if self.search_term:
             self._perform_search()
     
+    def _joined_text(self) -> Tuple[str, array]:
+        """Get the content as one string for searching.
+        
+        Returns:
+            Tuple[str, array]: Lines joined by newlines, and the start offset
+            of every line followed by the end of the text plus one
+        """
+        content = self.content
+        if content is not self._joined_source or content.version != self._joined_version:
+            lines = list(content)
+            self._joined_content = "\n".join(lines)
+            self._line_offsets = array('q', accumulate((len(line) + 1 for line in lines), initial=0))
+            self._joined_source = content
+            self._joined_version = content.version
+        return self._joined_content, self._line_offsets
+    
     def _perform_search(self):
         """Perform search with current term."""
-        self.search_results = []
-        
-        for i, line in enumerate(self.content):
-            for match in re.finditer(re.escape(self.search_term), line):
-                self.search_results.append((i, match.start(), match.end()))
+        key = (self.search_term, self.content.version)
+        if self.content is not self._search_source or key != self._search_key:
+            self._scan_search_results()
+            self._search_source = self.content
+            self._search_key = key
                 
         if self.search_results:
             self.current_search_idx = 0
@@ -92,6 +174,30 @@ class FileViewer(EditorComponent):
         else:
             self.set_status(f"No matches for '{self.search_term}'")
     
+    def _scan_search_results(self):
+        """Find all matches of the search term, compiling it only when it changed."""
+        pattern = re.escape(self.search_term)
+        if self._search_pattern is None or self._search_pattern.pattern != pattern:
+            self._search_pattern = re.compile(pattern)
+            
+        self.search_results = []
+        
+        # One regex pass over the whole text; terms never contain newlines,
+        # so every match lies within a single line
+        text, offsets = self._joined_text()
+        spans = [match.span() for match in self._search_pattern.finditer(text)]
+        
+        # Map absolute offsets back to lines
+        if HAS_NUMPY and spans:
+            starts = np.fromiter((start for start, _ in spans), dtype=np.int64, count=len(spans))
+            line_idxs = (np.searchsorted(np.frombuffer(offsets, dtype=np.int64), starts, side='right') - 1).tolist()
+        else:
+            line_idxs = [bisect_right(offsets, start) - 1 for start, _ in spans]
+            
+        for i, (start, end) in zip(line_idxs, spans):
+            line_start = offsets[i]
+            self.search_results.append((i, start - line_start, end - line_start))
+    
     def _next_search_result(self):
         """Go to next search result."""
         if not self.search_results:
@@ -120,53 +226,38 @@ class FileViewer(EditorComponent):
             return
             
         line_idx, start, end = self.search_results[idx]
-        
-        # Adjust scroll position
-        if line_idx < self.scroll_pos:
-            self.scroll_pos = line_idx
-        elif line_idx >= self.scroll_pos + self.height - 2:
-            self.scroll_pos = line_idx - (self.height - 3)
-            
-        # Set cursor position
-        self.cursor_y = line_idx - self.scroll_pos
-        self.cursor_x = start
+        self.goto_line(line_idx, start)
         
         self.set_status(f"Match {idx + 1}/{len(self.search_results)}")
     
     def _goto_line(self):
         """Go to specific line number."""
         line_num = self._get_input("Go to line: ")
+        n_lines = len(self.content)
         try:
             line_num = int(line_num)
-            if 1 <= line_num <= len(self.content):
-                # Adjust scroll position
-                if line_num - 1 < self.scroll_pos:
-                    self.scroll_pos = line_num - 1
-                elif line_num - 1 >= self.scroll_pos + self.height - 2:
-                    self.scroll_pos = line_num - 1 - (self.height - 3)
-                    
-                # Set cursor position
-                self.cursor_y = line_num - 1 - self.scroll_pos
-                self.cursor_x = 0
+            if 1 <= line_num <= n_lines:
+                self.goto_line(line_num - 1)
                 self.set_status(f"Moved to line {line_num}")
             else:
-                self.set_status(f"Line number out of range (1-{len(self.content)})")
+                self.set_status(f"Line number out of range (1-{n_lines})")
         except ValueError:
             self.set_status("Invalid line number")
     
     def _goto_end(self):
         """Go to end of file."""
-        if len(self.content) > 0:
+        n_lines = len(self.content)
+        if n_lines > 0:
             # Adjust scroll position
-            if len(self.content) > self.height - 2:
-                self.scroll_pos = len(self.content) - (self.height - 2)
+            if n_lines > self.height - 2:
+                self.scroll_pos = n_lines - (self.height - 2)
                 self.cursor_y = self.height - 3
             else:
                 self.scroll_pos = 0
-                self.cursor_y = len(self.content) - 1
+                self.cursor_y = n_lines - 1
                 
             # Set cursor to end of line
-            self.cursor_x = len(self.content[self.scroll_pos + self.cursor_y])
+            self.cursor_x = self.content.line_length(self.scroll_pos + self.cursor_y)
     
     def _goto_line_start(self):
         """Go to start of current line."""
@@ -176,16 +267,17 @@ class FileViewer(EditorComponent):
         """Go to end of current line."""
         current_line = self.scroll_pos + self.cursor_y
         if current_line < len(self.content):
-            self.cursor_x = len(self.content[current_line])
+            self.cursor_x = self.content.line_length(current_line)
     
     def _page_down(self):
         """Move down one page."""
         page_size = self.height - 3
-        self.scroll_pos = min(self.scroll_pos + page_size, max(0, len(self.content) - page_size))
+        n_lines = len(self.content)
+        self.scroll_pos = min(self.scroll_pos + page_size, max(0, n_lines - page_size))
         
         # Adjust cursor if needed
-        if self.scroll_pos + self.cursor_y >= len(self.content):
-            self.cursor_y = max(0, len(self.content) - self.scroll_pos - 1)
+        if self.scroll_pos + self.cursor_y >= n_lines:
+            self.cursor_y = max(0, n_lines - self.scroll_pos - 1)
     
     def _page_up(self):
         """Move up one page."""
@@ -200,6 +292,8 @@ class FileViewer(EditorComponent):
     def _toggle_syntax_highlighting(self):
         """Toggle syntax highlighting."""
         self.syntax_highlighting = not self.syntax_highlighting
+        self._hl_lines = []
+        self._hl_source = None
         self.set_status(f"Syntax highlighting {'on' if self.syntax_highlighting else 'off'}")
     
     def _toggle_line_wrap(self):
@@ -272,24 +366,27 @@ class FileViewer(EditorComponent):
         # Show prompt
         self.stdscr.addstr(self.height - 1, 0, prompt)
         
-        # Get input
-        input_str = ""
+        # Get input as UTF-8 bytes; curses delivers multi-byte characters
+        # one byte at a time
+        buf = bytearray()
         while True:
             try:
                 ch = self.stdscr.getch()
                 if ch == 10:  # Enter
                     break
                 elif ch == 27:  # Escape
-                    input_str = ""
+                    buf.clear()
                     break
                 elif ch == curses.KEY_BACKSPACE or ch == 127:  # Backspace
-                    if input_str:
-                        input_str = input_str[:-1]
+                    if buf:
+                        # Drop the last character along with its continuation bytes
+                        while buf and buf.pop() & 0xC0 == 0x80:
+                            pass
                         self.stdscr.move(self.height - 1, len(prompt))
                         self.stdscr.clrtoeol()
-                        self.stdscr.addstr(self.height - 1, len(prompt), input_str)
-                else:
-                    input_str += chr(ch)
+                        self.stdscr.addstr(self.height - 1, len(prompt), buf.decode('utf-8', errors='replace'))
+                elif ch < 256:
+                    buf.append(ch)
             except:
                 break
                 
@@ -297,7 +394,7 @@ class FileViewer(EditorComponent):
         curses.noecho()
         curses.curs_set(0)
         
-        return input_str
+        return buf.decode('utf-8', errors='replace')
     
     def _quit(self):
         """Quit viewer."""
@@ -329,55 +426,49 @@ class FileViewer(EditorComponent):
         visible_content = self.get_visible_content()
         
         # Apply syntax highlighting if enabled
-        highlighted_lines = {}
+        highlighted_lines = None
         if self.syntax_highlighting and self.lexer:
-            # Join visible content for highlighting
-            content_str = "\n".join([line for _, line in visible_content])
-            
-            # Highlight content
-            highlighted = highlight(content_str, self.lexer, self.formatter)
-            
-            # Split back into lines
-            highlighted_lines = dict(enumerate(highlighted.splitlines()))
+            highlighted_lines = self._highlighted_lines()
         
         # Draw content
         for i, (line_idx, line) in enumerate(visible_content):
             y = i + 1  # +1 for title bar
+            segments = []
             
             # Draw line number if enabled
             if self.show_line_numbers:
-                line_num = str(line_idx + 1).rjust(line_num_width - 1)
-                self.stdscr.addstr(y, 0, line_num, self.colors["line_number"])
-                self.stdscr.addstr(y, line_num_width - 1, " ")
+                line_num = _line_number(line_idx + 1, line_num_width - 1)
+                # Number and separator go out in a single write
+                segments.append((0, line_num, self.colors["line_number"]))
             
             # Handle line wrapping if enabled
             if self.wrap_lines and len(line) > self.width - line_num_width - 1:
                 # Calculate available width
                 avail_width = self.width - line_num_width - 1
                 
-                # Split line into chunks
-                chunks = [line[i:i+avail_width] for i in range(0, len(line), avail_width)]
+                # Split line into chunks, only as many as fit above the status bar
+                n_chunks = min(-(-len(line) // avail_width), max(1, self.height - 1 - y))
+                chunks = [line[k:k + avail_width] for k in range(0, n_chunks * avail_width, avail_width)]
                 
                 # Draw first chunk
-                if self.syntax_highlighting and line_idx in highlighted_lines:
+                if highlighted_lines is not None:
                     # Draw syntax highlighted line (first chunk only)
-                    highlighted_line = highlighted_lines[line_idx]
-                    self.stdscr.addstr(y, line_num_width, highlighted_line[:avail_width])
+                    segments.append((line_num_width, highlighted_lines[line_idx][:avail_width], 0))
                 else:
-                    self.stdscr.addstr(y, line_num_width, chunks[0])
+                    segments.append((line_num_width, chunks[0], 0))
+                self._set_line(y, segments)
                     
                 # Draw remaining chunks
-                for j, chunk in enumerate(chunks[1:], 1):
-                    if y + j < self.height - 1:  # Ensure we don't draw past bottom
-                        self.stdscr.addstr(y + j, line_num_width, chunk)
+                for j in range(1, len(chunks)):
+                    self._set_line(y + j, ((line_num_width, chunks[j], 0),))
             else:
                 # Draw single line
-                if self.syntax_highlighting and line_idx in highlighted_lines:
+                if highlighted_lines is not None:
                     # Draw syntax highlighted line
-                    highlighted_line = highlighted_lines[line_idx]
-                    self.stdscr.addstr(y, line_num_width, highlighted_line)
+                    segments.append((line_num_width, highlighted_lines[line_idx], 0))
                 else:
-                    self.stdscr.addstr(y, line_num_width, line)
+                    segments.append((line_num_width, line, 0))
+                self._set_line(y, segments)
     
     def run_viewer(self) -> None:
         """Run the viewer as a standalone component."""
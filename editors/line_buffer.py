@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Line buffer used to store editor content."""
+import re
+from array import array
+from collections.abc import MutableSequence
+from itertools import chain, islice
+from pathlib import Path
+from typing import Optional, List, Iterable, Iterator, Union, BinaryIO, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Line boundaries str.splitlines() honours besides \n and \r\n: a bare \r,
+# \v, \f, \x1c-\x1e, and U+0085, U+2028 and U+2029 encoded as UTF-8
+_OTHER_BREAKS = re.compile(rb'\r(?!\n)|[\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]')
+
+def _line_offsets(data: bytes) -> array:
+    """Index the start offset of every line in data.
+    
+    Args:
+        data: Raw file contents
+        
+    Returns:
+        array: Line start offsets, followed by the end offset of the last line
+    """
+    offsets = array('q', [0])
+    if HAS_NUMPY:
+        # Locate every newline in a single vectorized pass
+        newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 0x0A)
+        offsets.frombytes((newlines + 1).astype(np.int64).tobytes())
+    else:
+        find = data.find
+        pos = find(b'\n')
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = find(b'\n', pos + 1)
+            
+    if offsets[-1] != len(data):
+        offsets.append(len(data))
+    return offsets
+
+class LineBuffer(MutableSequence):
+    """Gap buffer of text lines.
+    
+    Lines live in a single list with a run of unused slots (the gap) at
+    the position of the last edit. Inserting or deleting lines near the
+    cursor only moves the gap instead of shifting every following line.
+    
+    Buffers loaded with from_file keep the raw file bytes plus an index of
+    line start offsets; slots hold the line number until the line is first
+    accessed and decoded.
+    """
+    
+    __slots__ = ('_lines', '_gap_start', '_gap_end', 'version', '_data', '_offsets', '_ascii')
+    
+    # Minimum number of free slots added when the gap is exhausted
+    MIN_GAP = 64
+    
+    def __init__(self, lines: Optional[Iterable[str]] = None):
+        """Initialize line buffer.
+        
+        Args:
+            lines: Optional initial lines
+        """
+        self._lines: List[Union[str, int, None]] = list(lines) if lines is not None else []
+        self._gap_start = len(self._lines)
+        self._gap_end = len(self._lines)
+        
+        # Incremented on every edit so views can tell when cached lines are stale
+        self.version = 0
+        
+        # Raw file data and line start offsets for lines not yet decoded
+        self._data: Optional[memoryview] = None
+        self._offsets: Optional[array] = None
+        
+        # Whether the raw data is pure ASCII, making byte lengths equal line lengths
+        self._ascii = False
+    
+    @classmethod
+    def from_file(cls, path: Path) -> 'LineBuffer':
+        """Create buffer that decodes lines of a file on first access.
+        
+        Lines are split where str.splitlines() would split them. Files that
+        are not valid UTF-8 raise, like a text-mode read, so their bytes are
+        never replaced and later saved back altered.
+        
+        Args:
+            path: Path to file
+            
+        Returns:
+            LineBuffer: Buffer with one entry per line
+            
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+            
+        if not data:
+            return cls([""])
+            
+        is_ascii = data.isascii()
+        if not is_ascii:
+            # Validate up front; lines decoded later then cannot fail
+            text = str(data, 'utf-8')
+            
+        if _OTHER_BREAKS.search(data):
+            # The offset index only knows \n and \r\n, so split these rare
+            # files eagerly instead
+            if is_ascii:
+                text = data.decode('ascii')
+            return cls(text.splitlines() or [""])
+            
+        offsets = _line_offsets(data)
+        buffer = cls(range(len(offsets) - 1))
+        buffer._data = memoryview(data)
+        buffer._offsets = offsets
+        buffer._ascii = data.isascii()
+        return buffer
+    
+    def __len__(self) -> int:
+        return len(self._lines) - (self._gap_end - self._gap_start)
+    
+    def __iter__(self) -> Iterator[str]:
+        decode = self._decode
+        for line in chain(islice(self._lines, 0, self._gap_start), islice(self._lines, self._gap_end, None)):
+            yield decode(line) if type(line) is int else line
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        slot = self._physical(index)
+        line = self._lines[slot]
+        if type(line) is int:
+            # Decode on first access and keep the result
+            line = self._lines[slot] = self._decode(line)
+        return line
+    
+    def __setitem__(self, index: int, line: str):
+        self._lines[self._physical(index)] = line
+        self.version += 1
+    
+    def __delitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            for i in sorted(range(*index.indices(len(self))), reverse=True):
+                del self[i]
+            return
+        
+        self._move_gap(self._normalize(index))
+        self._lines[self._gap_end] = None
+        self._gap_end += 1
+        self.version += 1
+    
+    def __repr__(self) -> str:
+        return f"LineBuffer({list(self)!r})"
+    
+    def insert(self, index: int, line: str):
+        """Insert line before index.
+        
+        Args:
+            index: Line index (clamped like list.insert)
+            line: Line to insert
+        """
+        size = len(self)
+        if index < 0:
+            index = max(0, index + size)
+        index = min(index, size)
+        
+        if self._gap_start == self._gap_end:
+            self._grow_gap()
+        
+        self._move_gap(index)
+        self._lines[self._gap_start] = line
+        self._gap_start += 1
+        self.version += 1
+    
+    def extend(self, lines: Iterable[str]):
+        """Append lines at the end of the buffer.
+        
+        Args:
+            lines: Lines to append
+        """
+        lines = list(lines)
+        self._move_gap(len(self))
+        self._lines[self._gap_start:self._gap_start] = lines
+        self._gap_start += len(lines)
+        self._gap_end += len(lines)
+        self.version += 1
+    
+    def copy(self) -> 'LineBuffer':
+        """Return a shallow copy of the buffer sharing the file data.
+        
+        Returns:
+            LineBuffer: Copy with the same lines
+        """
+        clone = LineBuffer(chain(islice(self._lines, 0, self._gap_start), islice(self._lines, self._gap_end, None)))
+        clone._data = self._data
+        clone._offsets = self._offsets
+        clone._ascii = self._ascii
+        return clone
+    
+    def line_length(self, index: int) -> int:
+        """Get length of a line, without decoding it if the file is ASCII.
+        
+        Args:
+            index: Line index
+            
+        Returns:
+            int: Number of characters in the line
+        """
+        line = self._lines[self._physical(index)]
+        if type(line) is int and self._ascii:
+            start, end = self._line_span(line)
+            return end - start
+        return len(self[index])
+    
+    def write_to(self, f: BinaryIO):
+        """Write lines to a binary file, separated by newlines.
+        
+        Lines that were never decoded are copied from the original bytes.
+        
+        Args:
+            f: Binary file object
+        """
+        write = f.write
+        data = self._data
+        first = True
+        for line in chain(islice(self._lines, 0, self._gap_start), islice(self._lines, self._gap_end, None)):
+            if not first:
+                write(b'\n')
+            first = False
+            
+            if type(line) is int:
+                start, end = self._line_span(line)
+                write(data[start:end])
+            else:
+                write(line.encode('utf-8'))
+    
+    def _line_span(self, line_no: int) -> Tuple[int, int]:
+        """Get byte range of a line of the original file.
+        
+        Args:
+            line_no: Line number in the original file
+            
+        Returns:
+            Tuple[int, int]: Start and end offsets, excluding the line ending
+        """
+        start = self._offsets[line_no]
+        end = self._offsets[line_no + 1]
+        data = self._data
+        if end > start and data[end - 1] == 0x0A:
+            end -= 1
+        if end > start and data[end - 1] == 0x0D:
+            end -= 1
+        return start, end
+    
+    def _decode(self, line_no: int) -> str:
+        """Decode a line of the original file.
+        
+        Args:
+            line_no: Line number in the original file
+            
+        Returns:
+            str: Line text without its line ending
+        """
+        start, end = self._line_span(line_no)
+        return str(self._data[start:end], 'utf-8')
+    
+    def _normalize(self, index: int) -> int:
+        """Convert index to a non-negative logical index.
+        
+        Args:
+            index: Line index, possibly negative
+        
+        Returns:
+            int: Logical index
+        """
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("line index out of range")
+        return index
+    
+    def _physical(self, index: int) -> int:
+        """Map logical line index to its slot in the backing list.
+        
+        Args:
+            index: Line index, possibly negative
+        
+        Returns:
+            int: Slot in the backing list
+        """
+        index = self._normalize(index)
+        if index < self._gap_start:
+            return index
+        return index + self._gap_end - self._gap_start
+    
+    def _move_gap(self, index: int):
+        """Move the gap so that it starts at logical index.
+        
+        Args:
+            index: Logical index for the gap start
+        """
+        lines = self._lines
+        gap_size = self._gap_end - self._gap_start
+        
+        if index < self._gap_start:
+            # Shift lines before the gap to after it
+            count = self._gap_start - index
+            lines[self._gap_end - count:self._gap_end] = lines[index:self._gap_start]
+        elif index > self._gap_start:
+            # Shift lines after the gap to before it
+            count = index - self._gap_start
+            lines[self._gap_start:index] = lines[self._gap_end:self._gap_end + count]
+        else:
+            return
+        
+        self._gap_start = index
+        self._gap_end = index + gap_size
+        
+        # Drop stale references left inside the gap
+        lines[self._gap_start:self._gap_end] = [None] * gap_size
+    
+    def _grow_gap(self):
+        """Enlarge the gap proportionally to the buffer size."""
+        extra = max(self.MIN_GAP, len(self) // 8)
+        self._lines[self._gap_end:self._gap_end] = [None] * extra
+        self._gap_end += extra
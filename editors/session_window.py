@@ -2,12 +2,221 @@
 # -*- coding: utf-8 -*-
 import os
 import curses
-import time
-import difflib
-from pygments import highlight
-from pygments.lexers import get_lexer_by_name, TextLexer
-from pygments.formatters import TerminalFormatter
-from typing import Optional, List, Dict, Any
+import functools
+import heapq
+import re
+import threading
+from pygments.token import Token
+from typing import Optional, List, Dict, Any, Tuple, Callable
+from editors import diff_engine
+from editors.editor_base import _lexer_for_filename
+
+def _regex_finder(pattern: str) -> Callable[[str], List[Tuple[int, int]]]:
+    """Compile a pattern into a function returning its match spans in a line.
+    
+    Args:
+        pattern: Regular expression
+        
+    Returns:
+        Callable[[str], List[Tuple[int, int]]]: Span finder
+    """
+    finditer = re.compile(pattern).finditer
+    return lambda line: [match.span() for match in finditer(line)]
+
+def _find_strings(line: str) -> List[Tuple[int, int]]:
+    """Find quoted strings in a line.
+    
+    Matches the same spans as the pattern (["'])((?:(?!\1).)*)\1: each
+    string runs from a quote to the next quote of the same kind.
+    
+    Args:
+        line: Line of code
+        
+    Returns:
+        List[Tuple[int, int]]: Start and end of every string, in order
+    """
+    spans = []
+    find = line.find
+    pos = 0
+    while True:
+        double = find('"', pos)
+        single = find("'", pos)
+        if double == -1 and single == -1:
+            break
+        start = single if double == -1 or (single != -1 and single < double) else double
+        end = find(line[start], start + 1)
+        if end == -1:
+            # Unterminated; a later quote of the other kind may still match
+            pos = start + 1
+            continue
+        spans.append((start, end + 1))
+        pos = end + 1
+    return spans
+
+# Preview syntax span finders, built once; matches are drawn in this order
+_PY_PATTERNS = [
+    ('keyword', _regex_finder(r'\b(def|class|import|from|return|if|elif|else|while|for|in|is|not|try|except|raise|with|as|True|False|None|self)\b')),
+    ('builtin', _regex_finder(r'\b(print|len|range|str|int|float|list|tuple|dict|set|super|__init__|pygame)\b')),
+    ('string', _find_strings),
+    ('number', _regex_finder(r'\b\d+(?:\.\d+)?\b')),
+    ('comment', _regex_finder(r'#.*$')),
+    ('decorator', _regex_finder(r'@\w+')),
+    ('operator', _regex_finder(r'[=<>!+\-*/]+')),
+    ('parentheses', _regex_finder(r'[\(\)\[\]\{\}]')),
+]
+
+# Basic syntax highlighting patterns for other languages
+_DEFAULT_PATTERNS = [
+    ('keyword', _regex_finder(r'\b(def|class|import|from|return|if|else|while|for|in|try|except|raise|True|False|None)\b')),
+    ('string', _find_strings),
+    ('number', _regex_finder(r'\b\d+\b')),
+    ('comment', _regex_finder(r'#.*$')),
+]
+
+# Preview highlight type of Pygments token types; subtypes inherit
+_TOKEN_TYPES = {
+    Token.Keyword: 'keyword',
+    Token.Name.Builtin: 'builtin',
+    Token.Name.Decorator: 'decorator',
+    Token.Literal.String: 'string',
+    Token.Literal.Number: 'number',
+    Token.Comment: 'comment',
+    Token.Operator: 'operator',
+    Token.Punctuation: 'parentheses',
+}
+
+def _token_matches(filename: str, content: str) -> Optional[List[List[Tuple[int, int, str]]]]:
+    """Lex content once with Pygments into highlight ranges per line.
+    
+    Args:
+        filename: File name used to pick the lexer
+        content: File content
+        
+    Returns:
+        Optional[List[List[Tuple[int, int, str]]]]: (start, end, type) ranges
+        of each line, or None if Pygments has no lexer for the file
+    """
+    # Pygments turns lone carriage returns into line breaks, which would
+    # shift its lines against content.split('\n')
+    if '\r' in content:
+        return None
+    lexer = _lexer_for_filename(filename, stripnl=False)
+    if lexer is None:
+        return None
+        
+    types = {}
+    line_matches = [[]]
+    col = 0
+    for ttype, value in lexer.get_tokens(content):
+        if ttype not in types:
+            parent = ttype
+            while parent not in _TOKEN_TYPES and parent is not Token:
+                parent = parent.parent
+            types[ttype] = _TOKEN_TYPES.get(parent)
+        pattern_type = types[ttype]
+        
+        # Split multi-line tokens at line boundaries
+        for k, part in enumerate(value.split('\n')):
+            if k:
+                line_matches.append([])
+                col = 0
+            if part and pattern_type is not None:
+                line_matches[-1].append((col, col + len(part), pattern_type))
+            col += len(part)
+            
+    return line_matches
+
+# Files longer than this skip the whole-file Pygments pass and are matched
+# line by line as they scroll into view
+_LEX_MAX_LINES = 20000
+
+@functools.lru_cache(maxsize=64)
+def _border(left: str, fill: str, count: int, right: str) -> str:
+    """Build a box border line.
+    
+    Args:
+        left: Left corner text
+        fill: Line character
+        count: Number of fill characters; none if not positive
+        right: Right corner text
+        
+    Returns:
+        str: Border line
+    """
+    return left + fill * count + right
+
+@functools.lru_cache(maxsize=32)
+def _wrap_description(text: str, width: int) -> Tuple[str, ...]:
+    """Word-wrap text to a width, breaking at the last space that fits.
+    
+    Args:
+        text: Text with newline-separated paragraphs
+        width: Maximum line length
+        
+    Returns:
+        Tuple[str, ...]: Wrapped lines
+    """
+    paras = text.split('\n')
+    if max(map(len, paras)) <= width:
+        # Nothing needs breaking; keep the non-empty paragraphs as they are
+        return tuple(para for para in paras if para)
+        
+    lines = []
+    for para in paras:
+        start = 0
+        while len(para) - start > width:
+            # Search only the window that fits instead of slicing the rest
+            space_pos = para.rfind(' ', start, start + width)
+            if space_pos == -1:
+                space_pos = start + width
+            lines.append(para[start:space_pos])
+            start = space_pos + 1
+        if start < len(para):
+            lines.append(para[start:])
+    return tuple(lines)
+
+class _LineBand:
+    """Pad holding the lines around the scroll position of a scroll view.
+    
+    Only a band of about four screens of lines is drawn at a time, so the
+    pad and the drawing work stay bounded however long the content is. The
+    band is drawn again around the view once scrolling leaves it.
+    """
+    
+    def __init__(self, total_lines: int, span: int, width: int,
+                 paint: Callable[[Any, int, int], None]):
+        """Initialize the band.
+        
+        Args:
+            total_lines: Number of lines in the view
+            span: Number of lines shown at once
+            width: Pad width in columns
+            paint: Called as paint(pad, pad_row, line_index) to draw a line
+        """
+        self.total_lines = total_lines
+        self.size = max(1, min(total_lines, 4 * span))
+        self.width = width
+        self.paint = paint
+        self.start = None
+        # The spare row lets the last line end in the pad's bottom-right cell
+        self.pad = curses.newpad(self.size + 1, width)
+        
+    def noutrefresh(self, scroll_pos: int, displayed: int, row: int, col: int):
+        """Copy the visible lines to the screen, drawing a new band if needed.
+        
+        Args:
+            scroll_pos: Index of the first visible line
+            displayed: Number of visible lines
+            row: Screen row of the first visible line
+            col: Screen column of the pad's left edge
+        """
+        if self.start is None or scroll_pos < self.start or scroll_pos + displayed > self.start + self.size:
+            # Center the view in the new band
+            self.start = max(0, min(scroll_pos - (self.size - displayed) // 2, self.total_lines - self.size))
+            self.pad.erase()
+            for pad_row in range(self.size):
+                self.paint(self.pad, pad_row, self.start + pad_row)
+        self.pad.noutrefresh(scroll_pos - self.start, 0, row, col, row + displayed - 1, col + self.width - 1)
 
 class SessionWindow:
     """Interactive session window for code generation and editing."""
@@ -16,10 +225,24 @@ class SessionWindow:
         """Initialize session window."""
         self.stdscr = stdscr
         self._init_colors()
+        # Attributes of the color pairs, looked up once for the drawing code
+        self._pairs = [curses.color_pair(i) for i in range(7)]
+        self._bold_pairs = [attr | curses.A_BOLD for attr in self._pairs]
+        
+        # Screen size, re-read when a new screen is laid out or on resize
+        self._size = stdscr.getmaxyx()
         self.loading_frames = ['⣾', '⣽', '⣻', '⢿', '⡿', '⣟', '⣯', '⣷']
         self.current_frame = 0
         self.is_loading = False
         self.loading_thread = None
+        self._loading_stop = threading.Event()
+        
+        # Segments of each scroll-view row as drawn in the previous frame
+        self._shadow: Dict[int, Tuple[Tuple[int, str, int], ...]] = {}
+        self._frame_rows = set()
+        
+        # Inputs and lines of the last diff shown, reused when shown again
+        self._last_diff: Optional[Tuple[Tuple[str, str, str], List[str]]] = None
 
     def __del__(self):
         """Clean up resources when the window is destroyed."""
@@ -49,63 +272,127 @@ class SessionWindow:
     def _draw_branding(self):
         """Draw ANJ DEV branding at top."""
         try:
-            width = self.stdscr.getmaxyx()[1]
+            width = self._size[1]
             # Draw ANJ DEV branding
-            self.stdscr.addstr(0, 0, "╔═════ ANJ DEV ════╗", curses.color_pair(1) | curses.A_BOLD)
-            self.stdscr.addstr(1, 0, "╚══by Adithyanraj══╝", curses.color_pair(3))
+            self.stdscr.addstr(0, 0, "╔═════ ANJ DEV ════╗", self._bold_pairs[1])
+            self.stdscr.addstr(1, 0, "╚══by Adithyanraj══╝", self._pairs[3])
 
         except curses.error:
             pass
 
+    def _layout_header(self, title: str, chapter: Optional[str] = None) -> List[Tuple[int, int, str, int]]:
+        """Lay out the session window header.
+        
+        Args:
+            title: Header title
+            chapter: Optional chapter number shown before the title
+            
+        Returns:
+            (row, col, text, attr) spans in drawing order
+        """
+        height, width = self._size
+        row = 3  # Start after branding
+        if chapter:
+            header = f"╔═ Chapter {chapter}: {title} "
+            header += "═" * (width - len(header) - 1) + "╗"
+            frame = [(row, 0, header, self._bold_pairs[1])]
+        else:
+            # Center title
+            title_pos = max(0, (width - len(title)) // 2)
+            frame = [
+                (row, 0, _border("╔═", "═", width - 4, "═╗"), self._pairs[1]),
+                (row, title_pos, f" {title} ", self._bold_pairs[1]),
+            ]
+            
+        # Session border extension
+        frame.append((row + 1, 0, "║", self._pairs[1]))
+        frame.append((row + 1, width - 1, "║", self._pairs[1]))
+        return frame
+    
     def _draw_header(self, title: str, chapter: Optional[str] = None):
         """Draw session window header with optional chapter number."""
+        # Draw branding first
+        self._draw_branding()
         try:
-            height, width = self.stdscr.getmaxyx()
-            # Draw branding first
-            self._draw_branding()
-            
-            # Draw title bar with chapter if provided
-            row = 3  # Start after branding
-            if chapter:
-                header = f"╔═ Chapter {chapter}: {title} "
-                header += "═" * (width - len(header) - 1) + "╗"
-                self.stdscr.addstr(row, 0, header, curses.color_pair(1) | curses.A_BOLD)
-            else:
-                self.stdscr.addstr(row, 0, "╔═" + "═" * (width - 4) + "═╗", curses.color_pair(1))
-                # Center title
-                title_pos = max(0, (width - len(title)) // 2)
-                self.stdscr.addstr(row, title_pos, f" {title} ", curses.color_pair(1) | curses.A_BOLD)
-
-            # Draw session border extension
-            self.stdscr.addstr(row + 1, 0, "║", curses.color_pair(1))
-            self.stdscr.addstr(row + 1, width - 1, "║", curses.color_pair(1))
+            self._draw_frame(self._layout_header(title, chapter))
         except curses.error:
             pass
     
+    def _layout_footer(self, prompt: str = None) -> List[Tuple[int, int, str, int]]:
+        """Lay out the session window footer.
+        
+        Args:
+            prompt: Optional prompt shown on the footer bar
+            
+        Returns:
+            (row, col, text, attr) spans in drawing order
+        """
+        height, width = self._size
+        frame = [(height - 1, 0, _border("╚═", "═", width - 4, "═╝"), self._pairs[1])]
+        if prompt:
+            frame.append((height - 1, 2, prompt, self._pairs[3]))
+        return frame
+    
     def _draw_footer(self, prompt: str = None):
         """Draw session window footer."""
         try:
-            height, width = self.stdscr.getmaxyx()
-            # Draw footer bar
-            self.stdscr.addstr(height-1, 0, "╚═" + "═" * (width - 4) + "═╝", curses.color_pair(1))
-            if prompt:
-                self.stdscr.addstr(height-1, 2, prompt, curses.color_pair(3))
+            self._draw_frame(self._layout_footer(prompt))
         except curses.error:
             pass
     
+    def _draw_frame(self, frame: List[Tuple[int, int, str, int]]):
+        """Draw laid-out spans in order.
+        
+        Args:
+            frame: (row, col, text, attr) spans from one of the _layout_ methods
+        """
+        for row, col, text, attr in frame:
+            self.stdscr.addstr(row, col, text, attr)
+    
     def clear(self):
         """Clear the session window."""
         self.stdscr.clear()
+        self._shadow = {}
+        self._size = self.stdscr.getmaxyx()
         self.stdscr.refresh()
     
+    def _put_row(self, row: int, segments: Tuple[Tuple[int, str, int], ...]):
+        """Draw a row unless it matches the previous frame.
+        
+        The row is cleared from the first segment's column before drawing.
+        
+        Args:
+            row: Screen row
+            segments: (col, text, attr) spans making up the row, drawn in order
+        """
+        self._frame_rows.add(row)
+        if self._shadow.get(row) == segments:
+            return
+            
+        self._shadow[row] = segments
+        self.stdscr.move(row, segments[0][0])
+        self.stdscr.clrtoeol()
+        for col, text, attr in segments:
+            self.stdscr.addstr(row, col, text, attr)
+    
+    def _end_frame(self):
+        """Clear rows drawn in the previous frame but not in this one."""
+        for row in [row for row in self._shadow if row not in self._frame_rows]:
+            self.stdscr.move(row, self._shadow.pop(row)[0][0])
+            self.stdscr.clrtoeol()
+        self._frame_rows = set()
+    
     def start_loading(self, message: str):
         """Start loading animation with message."""
-        import threading
-        
-        def loading_animation():
-            while self.is_loading:
+        def loading_animation(stop: threading.Event):
+            # Waiting on the event instead of sleeping lets stop_loading end
+            # the animation at once, before it cleans up the box
+            while not stop.is_set():
                 try:
-                    height, width = self.stdscr.getmaxyx()
+                    # The spinner runs while the caller blocks, so it keeps the cached
+                    # size current through resizes nobody else is polling for
+                    self._size = self.stdscr.getmaxyx()
+                    height, width = self._size
                     box_width = min(len(message) + 10, width - 4)
                     row = height - 4
                     
@@ -118,29 +405,36 @@ class SessionWindow:
                         self.stdscr.clrtoeol()
                     
                     # Draw loading box
-                    self.stdscr.addstr(row, 2, "┌─ Loading " + "─" * (box_width - 10) + "┐", curses.color_pair(6))
-                    self.stdscr.addstr(row + 1, 2, f"│ {frame} {message.ljust(box_width - 4)} │", curses.color_pair(6))
-                    self.stdscr.addstr(row + 2, 2, "└" + "─" * (box_width - 2) + "─┘", curses.color_pair(6))
+                    self.stdscr.addstr(row, 2, _border("┌─ Loading ", "─", box_width - 10, "┐"), self._pairs[6])
+                    self.stdscr.addstr(row + 1, 2, f"│ {frame} {message.ljust(box_width - 4)} │", self._pairs[6])
+                    self.stdscr.addstr(row + 2, 2, _border("└", "─", box_width - 2, "─┘"), self._pairs[6])
                     
-                    self.stdscr.refresh()
-                    time.sleep(0.1)
+                    self.stdscr.noutrefresh()
+                    curses.doupdate()
                 except (curses.error, RuntimeError):
                     pass
+                stop.wait(0.1)
 
         # Ensure any existing loading is stopped
         self.stop_loading()
         
         # Start new loading animation
         self.is_loading = True
-        self.loading_thread = threading.Thread(target=loading_animation)
+        self._loading_stop = threading.Event()
+        self.loading_thread = threading.Thread(target=loading_animation, args=(self._loading_stop,))
         self.loading_thread.daemon = True
         self.loading_thread.start()
     
     def stop_loading(self):
         """Stop loading animation and clean up loading box."""
         self.is_loading = False
+        self._loading_stop.set()
+        
+        # Let a frame being drawn finish so it cannot land after the cleanup
+        if self.loading_thread and self.loading_thread is not threading.current_thread():
+            self.loading_thread.join(timeout=0.5)
         try:
-            height, width = self.stdscr.getmaxyx()
+            height, width = self._size
             # Clean up loading box area (4 lines total)
             for i in range(4):
                 self.stdscr.move(height - 5 + i, 0)
@@ -149,6 +443,51 @@ class SessionWindow:
         except curses.error:
             pass
     
+    def _layout_plan(self, description: str, files: Dict[str, List[str]]) -> List[Tuple[int, int, str, int]]:
+        """Lay out the plan description box and file list.
+        
+        Args:
+            description: Plan description, wrapped to the box
+            files: Paths to create and modify, under 'create' and 'modify'
+            
+        Returns:
+            (row, col, text, attr) spans in drawing order
+        """
+        # Create a box for the description
+        height, width = self._size
+        box_width = min(80, width - 4)  # Max width of 80 chars or screen width
+        
+        # Box top
+        frame = [(2, 2, _border("┌", "─", box_width - 2, "┐"), self._pairs[1])]
+        
+        # Split description lines into the box
+        row = 3
+        for line in _wrap_description(description, box_width - 4):
+            if row >= height - 8:  # Leave space for files
+                break
+            padded_line = line.ljust(box_width - 4)
+            frame.append((row, 2, f"│ {padded_line} │", self._pairs[1]))
+            row += 1
+        
+        # Box bottom
+        frame.append((row, 2, _border("└", "─", box_width - 2, "┘"), self._pairs[1]))
+        row += 2
+        
+        # Show files in a similar box
+        if files.get('create') or files.get('modify'):
+            # Title for files section
+            frame.append((row, 2, _border("┌── Files to Modify ───", "─", box_width - 19, "┐"), self._pairs[1]))
+            row += 1
+        
+        for file in files.get('create', []):
+            frame.append((row, 4, f"+ {file}", self._pairs[2]))
+            row += 1
+            
+        for file in files.get('modify', []):
+            frame.append((row, 4, f"* {file}", self._pairs[3]))
+            row += 1
+        return frame
+    
     def show_plan(self, title: str, description: str, files: Dict[str, List[str]]) -> bool | str:
         """Show the planning step with file operations.
         
@@ -160,55 +499,10 @@ class SessionWindow:
         self._draw_header("Implementation Plan", "1")
         
         try:
-            # Create a box for the description
-            height, width = self.stdscr.getmaxyx()
-            box_width = min(80, width - 4)  # Max width of 80 chars or screen width
-            
-            # Draw box top
-            self.stdscr.addstr(2, 2, "┌" + "─" * (box_width - 2) + "┐", curses.color_pair(1))
-            
-            # Split and display description in the box
-            lines = []
-            for para in description.split('\n'):
-                while para and len(para) > box_width - 4:
-                    # Find last space in the line width
-                    space_pos = para[:box_width-4].rfind(' ')
-                    if space_pos == -1:
-                        space_pos = box_width - 4
-                    lines.append(para[:space_pos])
-                    para = para[space_pos+1:]
-                if para:
-                    lines.append(para)
-                    
-            # Display description lines
-            row = 3
-            for line in lines:
-                if row >= height - 8:  # Leave space for files
-                    break
-                padded_line = line.ljust(box_width - 4)
-                self.stdscr.addstr(row, 2, f"│ {padded_line} │", curses.color_pair(1))
-                row += 1
-            
-            # Draw box bottom
-            self.stdscr.addstr(row, 2, "└" + "─" * (box_width - 2) + "┘", curses.color_pair(1))
-            row += 2
-            
-            # Show files in a similar box
-            if files.get('create') or files.get('modify'):
-                # Title for files section
-                self.stdscr.addstr(row, 2, "┌── Files to Modify ───" + "─" * (box_width - 19) + "┐", curses.color_pair(1))
-                row += 1
-            
-            for file in files.get('create', []):
-                self.stdscr.addstr(row, 4, f"+ {file}", curses.color_pair(2))
-                row += 1
-                
-            for file in files.get('modify', []):
-                self.stdscr.addstr(row, 4, f"* {file}", curses.color_pair(3))
-                row += 1
-            
+            self._draw_frame(self._layout_plan(description, files))
             self._draw_footer("Accept changes? [Y/n/e(dit)]")
-            self.stdscr.refresh()
+            # get_input sends the frame together with the prompt
+            self.stdscr.noutrefresh()
             
             response = self.get_input("Accept changes?", ["Y", "n", "e(dit)"])
             if response == 'y':
@@ -228,129 +522,124 @@ class SessionWindow:
         self._draw_header(f"Code Preview: {filename}", "2")
         
         try:
-            height, width = self.stdscr.getmaxyx()
+            height, width = self._size
             box_width = min(120, width - 4)  # Max width of 120 chars or screen width
             
             row = 2
             # Show file type indicator in a mini box
             status = " New File " if is_new else " Existing File "
             status_box = "┌" + "─" * len(status) + "┐"
-            self.stdscr.addstr(row, 2, status_box, curses.color_pair(2 if is_new else 3))
+            self.stdscr.addstr(row, 2, status_box, self._pairs[2 if is_new else 3])
             row += 1
-            self.stdscr.addstr(row, 2, "│" + status + "│", curses.color_pair(2 if is_new else 3))
+            self.stdscr.addstr(row, 2, "│" + status + "│", self._pairs[2 if is_new else 3])
             row += 1
-            self.stdscr.addstr(row, 2, "└" + "─" * len(status) + "┘", curses.color_pair(2 if is_new else 3))
+            self.stdscr.addstr(row, 2, "└" + "─" * len(status) + "┘", self._pairs[2 if is_new else 3])
             row += 2
             
             # Draw code box border
-            self.stdscr.addstr(row, 2, "┌── Code ──" + "─" * (box_width - 10) + "┐", curses.color_pair(1))
+            self.stdscr.addstr(row, 2, _border("┌── Code ──", "─", box_width - 10, "┐"), self._pairs[1])
             row += 1
             
-            # Get appropriate lexer for syntax highlighting
-            try:
-                ext = filename.split('.')[-1]
-                lexer = get_lexer_by_name(ext)
-            except:
-                lexer = TextLexer()
-            
             # Highlight code with curses-compatible colors
             lines = content.split('\n')
             
             # Define color mappings for different code elements
             code_colors = {
-                'keyword': curses.color_pair(6),   # Magenta for keywords
-                'string': curses.color_pair(2),    # Green for strings
-                'number': curses.color_pair(3),    # Yellow for numbers
-                'comment': curses.color_pair(1),   # Cyan for comments
-                'default': curses.color_pair(5)    # White for regular text
+                'keyword': self._pairs[6],   # Magenta for keywords
+                'string': self._pairs[2],    # Green for strings
+                'number': self._pairs[3],    # Yellow for numbers
+                'comment': self._pairs[1],   # Cyan for comments
+                'default': self._pairs[5]    # White for regular text
             }
             
             # Language-specific patterns
             if filename.endswith('.py'):
-                patterns = {
-                    'keyword': r'\b(def|class|import|from|return|if|elif|else|while|for|in|is|not|try|except|raise|with|as|True|False|None|self)\b',
-                    'builtin': r'\b(print|len|range|str|int|float|list|tuple|dict|set|super|__init__|pygame)\b',
-                    'string': r'(["\'])((?:(?!\1).)*)\1',
-                    'number': r'\b\d+(?:\.\d+)?\b',
-                    'comment': r'#.*$',
-                    'decorator': r'@\w+',
-                    'operator': r'[=<>!+\-*/]+',
-                    'parentheses': r'[\(\)\[\]\{\}]'
-                }
+                patterns = _PY_PATTERNS
                 code_colors.update({
-                    'builtin': curses.color_pair(6),     # Magenta for builtins
-                    'decorator': curses.color_pair(6),   # Magenta for decorators
-                    'operator': curses.color_pair(3),    # Yellow for operators
-                    'parentheses': curses.color_pair(1)  # Cyan for parentheses
+                    'builtin': self._pairs[6],     # Magenta for builtins
+                    'decorator': self._pairs[6],   # Magenta for decorators
+                    'operator': self._pairs[3],    # Yellow for operators
+                    'parentheses': self._pairs[1]  # Cyan for parentheses
                 })
             else:
-                # Basic syntax highlighting patterns
-                patterns = {
-                    'keyword': r'\b(def|class|import|from|return|if|else|while|for|in|try|except|raise|True|False|None)\b',
-                    'string': r'(["\'])((?:(?!\1).)*)\1',
-                    'number': r'\b\d+\b',
-                    'comment': r'#.*$'
-                }
+                patterns = _DEFAULT_PATTERNS
 
-            import re
             # Add scrolling support
             scroll_pos = 0
             max_display_lines = height - row - 5  # Leave space for borders and prompts
             total_lines = len(lines)
             
+            # Lex the whole file once when Pygments knows the language;
+            # otherwise match the patterns when a line is first shown
+            token_matches = _token_matches(filename, content) if total_lines <= _LEX_MAX_LINES else None
+            match_cache: Dict[int, List[Tuple[int, int, str]]] = {}
+            
+            def get_matches(i):
+                """Get the highlight ranges of line i, matching them on first use."""
+                if token_matches is not None:
+                    return token_matches[i]
+                matches = match_cache.get(i)
+                if matches is None:
+                    # Each pattern yields its matches in order, so merge the
+                    # streams by start position; ties keep pattern order
+                    matches = list(heapq.merge(
+                        *[[(start, end, pattern_type) for start, end in find(lines[i])]
+                          for pattern_type, find in patterns],
+                        key=lambda x: x[0]))
+                    match_cache[i] = matches
+                return matches
+            
+            def paint(pad, r, i):
+                """Draw line i into row r of the pad, which starts at screen column 2."""
+                line = lines[i]
+                pad_width = box_width - 2
+                
+                # Line number and separator
+                pad.addstr(r, 0, f"│ {i+1:4d} │ ", self._pairs[1])
+                
+                # Code line with syntax highlighting, clipped at the right border
+                pos = 8  # Starting position after line number
+                limit = pad_width - 1 - pos
+                # Display code with highlighting
+                last_pos = 0
+                for start, end, pattern_type in get_matches(i):
+                    if start >= limit:
+                        break
+                    # Add any text before this match
+                    if start > last_pos:
+                        pad.addstr(r, pos + last_pos, line[last_pos:start], code_colors['default'])
+                    # Add the highlighted match
+                    pad.addstr(r, pos + start, line[start:min(end, limit)], code_colors.get(pattern_type, code_colors['default']))
+                    last_pos = end
+                
+                # Add any remaining text
+                if last_pos < min(len(line), limit):
+                    pad.addstr(r, pos + last_pos, line[last_pos:limit], code_colors['default'])
+                
+                # Right border
+                pad.addstr(r, pad_width - 1, "│", self._pairs[1])
+            
+            band = _LineBand(total_lines, max_display_lines, box_width - 2, paint)
             while True:
-                # Clear display area
-                for i in range(max_display_lines):
-                    self.stdscr.move(row + i, 2)
-                    self.stdscr.clrtoeol()
+                displayed_lines = max(0, min(max_display_lines, total_lines - scroll_pos))
                 
-                # Display visible portion of code
-                displayed_lines = 0
-                for i in range(scroll_pos, min(scroll_pos + max_display_lines, total_lines)):
-                    line = lines[i]
-                    
-                    # Line number and separator
-                    self.stdscr.addstr(row + displayed_lines, 2, f"│ {i+1:4d} │ ", curses.color_pair(1))
-                    
-                    # Code line with syntax highlighting
-                    pos = 10  # Starting position after line number
-                    # Process each syntax pattern
-                    matches = []
-                    for pattern_type, pattern in patterns.items():
-                        for match in re.finditer(pattern, line):
-                            matches.append((match.start(), match.end(), pattern_type))
-                    
-                    # Sort matches by start position
-                    matches.sort(key=lambda x: x[0])
-                    
-                    # Display code with highlighting
-                    last_pos = 0
-                    for start, end, pattern_type in matches:
-                        # Add any text before this match
-                        if start > last_pos:
-                            self.stdscr.addstr(row + displayed_lines, pos + last_pos, 
-                                             line[last_pos:start], code_colors['default'])
-                        # Add the highlighted match
-                        self.stdscr.addstr(row + displayed_lines, pos + start,
-                                         line[start:end], code_colors[pattern_type])
-                        last_pos = end
-                    
-                    # Add any remaining text
-                    if last_pos < len(line):
-                        self.stdscr.addstr(row + displayed_lines, pos + last_pos,
-                                         line[last_pos:], code_colors['default'])
-                    
-                    # Right border
-                    self.stdscr.addstr(row + displayed_lines, box_width-1, "│", curses.color_pair(1))
-                    displayed_lines += 1
+                # Forget the matches of lines far from the view
+                if len(match_cache) > 16 * max_display_lines:
+                    for i in [i for i in match_cache if abs(i - scroll_pos) > 4 * max_display_lines]:
+                        del match_cache[i]
                 
                 # Show scroll indicators
                 if scroll_pos > 0:
-                    self.stdscr.addstr(row - 1, 2, "↑ More (PgUp/Up) ↑", curses.color_pair(3))
+                    self.stdscr.addstr(row - 1, 2, "↑ More (PgUp/Up) ↑", self._pairs[3])
                 if scroll_pos + max_display_lines < total_lines:
-                    self.stdscr.addstr(row + displayed_lines, 2, "↓ More (PgDn/Down) ↓", curses.color_pair(3))
+                    self._put_row(row + displayed_lines, ((2, "↓ More (PgDn/Down) ↓", self._pairs[3]),))
+                self._end_frame()
                 
-                self.stdscr.refresh()
+                # The pad goes out after stdscr so the code rows land on top
+                self.stdscr.noutrefresh()
+                if displayed_lines:
+                    band.noutrefresh(scroll_pos, displayed_lines, row, 2)
+                curses.doupdate()
                 
                 # Handle keyboard input
                 ch = self.stdscr.getch()
@@ -361,15 +650,18 @@ class SessionWindow:
                 elif ch == curses.KEY_PPAGE:  # Page Up
                     scroll_pos = max(0, scroll_pos - max_display_lines)
                 elif ch == curses.KEY_NPAGE:  # Page Down
-                    scroll_pos = min(total_lines - max_display_lines, scroll_pos + max_display_lines)
+                    scroll_pos = max(0, min(total_lines - max_display_lines, scroll_pos + max_display_lines))
                 elif ch == curses.KEY_RESIZE:
                     # Handle terminal resize
-                    height, width = self.stdscr.getmaxyx()
+                    self._size = self.stdscr.getmaxyx()
+                    height, width = self._size
                     box_width = min(120, width - 4)
                     max_display_lines = height - row - 5
                     displayed_lines = 0
                     self.stdscr.clear()
+                    self._shadow = {}
                     self._draw_header(f"Code Preview: {filename}", "2")
+                    band = _LineBand(total_lines, max_display_lines, box_width - 2, paint)
                     continue
                 elif ch in (ord('y'), ord('Y')):
                     return True
@@ -391,75 +683,78 @@ class SessionWindow:
         self._draw_header(f"Code Changes: {filename}", "3")
         
         try:
-            height, width = self.stdscr.getmaxyx()
+            height, width = self._size
             box_width = min(120, width - 4)  # Max width or screen width
             
             row = 2
             # Draw info box
-            self.stdscr.addstr(row, 2, "┌── Showing changes " + "─" * (box_width - 17) + "┐", curses.color_pair(1))
+            self.stdscr.addstr(row, 2, _border("┌── Showing changes ", "─", box_width - 17, "┐"), self._pairs[1])
             row += 1
-            self.stdscr.addstr(row, 2, "│ - : Removed lines", curses.color_pair(4))
+            self.stdscr.addstr(row, 2, "│ - : Removed lines", self._pairs[4])
             row += 1
-            self.stdscr.addstr(row, 2, "│ + : Added lines", curses.color_pair(2))
+            self.stdscr.addstr(row, 2, "│ + : Added lines", self._pairs[2])
             row += 1
-            self.stdscr.addstr(row, 2, "└" + "─" * (box_width - 2) + "┘", curses.color_pair(1))
+            self.stdscr.addstr(row, 2, _border("└", "─", box_width - 2, "┘"), self._pairs[1])
             row += 2
             
-            # Generate diff
-            diff = list(difflib.unified_diff(
-                original.splitlines(keepends=True),
-                modified.splitlines(keepends=True),
-                fromfile=f'a/{filename}',
-                tofile=f'b/{filename}'
-            ))
+            # Generate diff; the engine matches the common head and tail
+            # directly and only diffs the lines in between
+            key = (filename, original, modified)
+            if self._last_diff is not None and self._last_diff[0] == key:
+                diff = self._last_diff[1]
+            else:
+                diff = diff_engine.unified_diff(
+                    original.splitlines(keepends=True),
+                    modified.splitlines(keepends=True),
+                    fromfile=f'a/{filename}',
+                    tofile=f'b/{filename}'
+                )
+                self._last_diff = (key, diff)
             
             # Add scrolling support for diff view
             scroll_pos = 0
             max_display_lines = height - row - 5  # Leave space for borders and prompts
             total_lines = len(diff)
             
-            while True:
-                # Clear display area
-                for i in range(max_display_lines):
-                    self.stdscr.move(row + i, 2)
-                    self.stdscr.clrtoeol()
+            def paint(pad, r, i):
+                """Draw diff line i into row r of the pad, which starts at screen column 2."""
+                content_width = box_width - 2
+                line = diff[i].rstrip('\n')
                 
-                # Display visible portion of diff
-                displayed_lines = 0
-                for i in range(scroll_pos, min(scroll_pos + max_display_lines, total_lines)):
-                    if displayed_lines >= max_display_lines:
-                        break
-                    
-                    line = diff[i].rstrip('\n')
+                # Format each line
+                if line.startswith('+'):
+                    color = self._pairs[2]
+                elif line.startswith('-'):
+                    color = self._pairs[4]
+                elif line.startswith('@@'):
+                    color = self._pairs[6]
+                else:
+                    color = self._pairs[5]
                 
-                    # Format each line
-                    if line.startswith('+'):
-                        self.stdscr.addstr(row + displayed_lines, 2, "│", curses.color_pair(1))
-                        self.stdscr.addstr(row + displayed_lines, 3, line.ljust(box_width - 3), curses.color_pair(2))
-                    elif line.startswith('-'):
-                        self.stdscr.addstr(row + displayed_lines, 2, "│", curses.color_pair(1))
-                        self.stdscr.addstr(row + displayed_lines, 3, line.ljust(box_width - 3), curses.color_pair(4))
-                    elif line.startswith('@@'):
-                        self.stdscr.addstr(row + displayed_lines, 2, "│", curses.color_pair(1))
-                        self.stdscr.addstr(row + displayed_lines, 3, line.ljust(box_width - 3), curses.color_pair(6))
-                    else:
-                        self.stdscr.addstr(row + displayed_lines, 2, "│", curses.color_pair(1))
-                        self.stdscr.addstr(row + displayed_lines, 3, line.ljust(box_width - 3), curses.color_pair(5))
-                    
-                    # Right border
-                    self.stdscr.addstr(row + displayed_lines, box_width + 1, "│", curses.color_pair(1))
-                    displayed_lines += 1
+                # Write borders and line in one call, then color the line
+                pad.addstr(r, 0, f"│{line[:content_width].ljust(content_width)}│", self._pairs[1])
+                pad.chgat(r, 1, content_width, color)
+            
+            band = _LineBand(total_lines, max_display_lines, box_width, paint)
+            while True:
+                displayed_lines = max(0, min(max_display_lines, total_lines - scroll_pos))
                 
                 # Show scroll indicators
                 if scroll_pos > 0:
-                    self.stdscr.addstr(row - 1, 2, "↑ More (PgUp/Up) ↑", curses.color_pair(3))
-                if scroll_pos + max_display_lines < total_lines:
-                    self.stdscr.addstr(row + displayed_lines, 2, "↓ More (PgDn/Down) ↓", curses.color_pair(3))
+                    self.stdscr.addstr(row - 1, 2, "↑ More (PgUp/Up) ↑", self._pairs[3])
                 
-                # Draw bottom border
-                self.stdscr.addstr(row + displayed_lines, 2, "└" + "─" * (box_width - 2) + "┘", curses.color_pair(1))
+                # Draw bottom border, over the scroll-down indicator when shown
+                footer = ((2, _border("└", "─", box_width - 2, "┘"), self._pairs[1]),)
+                if scroll_pos + max_display_lines < total_lines:
+                    footer = ((2, "↓ More (PgDn/Down) ↓", self._pairs[3]),) + footer
+                self._put_row(row + displayed_lines, footer)
+                self._end_frame()
                 
-                self.stdscr.refresh()
+                # The pad goes out after stdscr so the diff rows land on top
+                self.stdscr.noutrefresh()
+                if displayed_lines:
+                    band.noutrefresh(scroll_pos, displayed_lines, row, 2)
+                curses.doupdate()
                 
                 # Handle keyboard input
                 ch = self.stdscr.getch()
@@ -470,15 +765,18 @@ class SessionWindow:
                 elif ch == curses.KEY_PPAGE:  # Page Up
                     scroll_pos = max(0, scroll_pos - max_display_lines)
                 elif ch == curses.KEY_NPAGE:  # Page Down
-                    scroll_pos = min(total_lines - max_display_lines, scroll_pos + max_display_lines)
+                    scroll_pos = max(0, min(total_lines - max_display_lines, scroll_pos + max_display_lines))
                 elif ch == curses.KEY_RESIZE:
                     # Handle terminal resize
-                    height, width = self.stdscr.getmaxyx()
+                    self._size = self.stdscr.getmaxyx()
+                    height, width = self._size
                     box_width = min(120, width - 4)
                     max_display_lines = height - row - 5
                     displayed_lines = 0
                     self.stdscr.clear()
+                    self._shadow = {}
                     self._draw_header(f"Code Changes: {filename}", "3")
+                    band = _LineBand(total_lines, max_display_lines, box_width, paint)
                     continue
                 elif ch in (ord('y'), ord('Y')):
                     return True
@@ -493,7 +791,7 @@ class SessionWindow:
     def show_error(self, message: str):
         """Show error message with box formatting."""
         try:
-            height, width = self.stdscr.getmaxyx()
+            height, width = self._size
             box_width = min(80, width - 4)  # Max width of 80 chars or screen width
             row = height - 6  # Position error box 6 lines from bottom
             
@@ -503,7 +801,7 @@ class SessionWindow:
                 self.stdscr.clrtoeol()
             
             # Draw error box with double borders for emphasis
-            self.stdscr.addstr(row, 2, "╔═ ERROR " + "═" * (box_width - 9) + "╗", curses.color_pair(4))
+            self.stdscr.addstr(row, 2, _border("╔═ ERROR ", "═", box_width - 9, "╗"), self._pairs[4])
             # Split long messages into multiple lines
             remaining_msg = message
             line_count = 0
@@ -520,15 +818,15 @@ class SessionWindow:
                 else:
                     remaining_msg = ""
                     
-                self.stdscr.addstr(row + 1 + line_count, 2, "║ " + disp_msg.ljust(box_width - 4) + " ║", curses.color_pair(4))
+                self.stdscr.addstr(row + 1 + line_count, 2, "║ " + disp_msg.ljust(box_width - 4) + " ║", self._pairs[4])
                 line_count += 1
                 
             # Add ellipsis if message was truncated
             if remaining_msg:
-                self.stdscr.addstr(row + 1 + line_count, 2, "║ " + "..." + " "*(box_width - 7) + " ║", curses.color_pair(4))
+                self.stdscr.addstr(row + 1 + line_count, 2, "║ " + "..." + " "*(box_width - 7) + " ║", self._pairs[4])
             
             # Draw bottom border
-            #self.stdscr.addstr(row + 3, 2, "╚" + "═" * (box_width - 2) + "╝", curses.color_pair(4))
+            #self.stdscr.addstr(row + 3, 2, "╚" + "═" * (box_width - 2) + "╝", self._pairs[4])
             #self.stdscr.refresh()
             
         except curses.error:
@@ -537,25 +835,25 @@ class SessionWindow:
     def get_input(self, prompt: str, choices: List[str] = None) -> str:
         """Get user input with prompt and optional choices."""
         try:
-            height, width = self.stdscr.getmaxyx()
+            height, width = self._size
             prompt_line = f"{prompt}: "
             
             # Draw bottom border with space for input
-            self.stdscr.addstr(height-2, 0, "╚" + "═" * (width - 2) + "╝", curses.color_pair(1))
+            self.stdscr.addstr(height-2, 0, _border("╚", "═", width - 2, "╝"), self._pairs[1])
             # Show prompt above border
-            self.stdscr.addstr(height-3, 2, prompt_line, curses.color_pair(3))
+            self.stdscr.addstr(height-3, 2, prompt_line, self._pairs[3])
             
             if choices:
                 # Show choices with different colors for Y/N/E
                 for i, choice in enumerate(choices):
                     if i > 0:
-                        self.stdscr.addstr("/", curses.color_pair(5))
+                        self.stdscr.addstr("/", self._pairs[5])
                     if choice.lower() == 'y':
-                        self.stdscr.addstr(choice, curses.color_pair(2))  # Green for yes
+                        self.stdscr.addstr(choice, self._pairs[2])  # Green for yes
                     elif choice.lower() == 'n':
-                        self.stdscr.addstr(choice, curses.color_pair(4))  # Red for no
+                        self.stdscr.addstr(choice, self._pairs[4])  # Red for no
                     else:
-                        self.stdscr.addstr(choice, curses.color_pair(6))  # Magenta for edit
+                        self.stdscr.addstr(choice, self._pairs[6])  # Magenta for edit
             
             self.stdscr.refresh()
             
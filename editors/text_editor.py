@@ -2,15 +2,34 @@
 # -*- coding: utf-8 -*-
 """Text editor component with syntax highlighting."""
 import curses
+import functools
 import os
 import re
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 from pygments import highlight
-from pygments.lexers import get_lexer_for_filename, TextLexer
+from pygments.lexers import TextLexer
 from pygments.formatters import Terminal256Formatter
 from pygments.token import Token
-from editors.editor_base import EditorComponent
+from editors.editor_base import EditorComponent, _lexer_for_filename
+from editors.line_buffer import LineBuffer
+
+@functools.lru_cache(maxsize=4096)
+def _highlight_line(line: str, lexer, formatter) -> str:
+    """Highlight one line of source.
+    
+    Keyed by the line text, so edited lines miss and unchanged lines are
+    reused however often the editor redraws.
+    
+    Args:
+        line: Line text
+        lexer: Pygments lexer of the file
+        formatter: Pygments formatter
+        
+    Returns:
+        str: Highlighted line without a trailing newline
+    """
+    return highlight(line, lexer, formatter).rstrip('\n')
 
 class TextEditor(EditorComponent):
     """Text editor with syntax highlighting and editing capabilities."""
@@ -105,11 +124,8 @@ class TextEditor(EditorComponent):
         self.formatter = Terminal256Formatter()
         
         if self.filepath:
-            try:
-                self.lexer = get_lexer_for_filename(self.filepath.name)
-            except:
-                self.lexer = TextLexer()
-        else:
+            self.lexer = _lexer_for_filename(self.filepath.name)
+        if self.lexer is None:
             self.lexer = TextLexer()
     
     def _save_snapshot(self):
@@ -277,7 +293,7 @@ class TextEditor(EditorComponent):
             
             # Adjust cursor if needed
             if len(self.content) == 0:
-                self.content = [""]
+                self.content = LineBuffer([""])
                 self.cursor_x = 0
             elif current_line >= len(self.content):
                 self.move_cursor(-1, 0)
@@ -360,16 +376,7 @@ class TextEditor(EditorComponent):
             return
             
         line_idx, start, end = self.search_results[idx]
-        
-        # Adjust scroll position
-        if line_idx < self.scroll_pos:
-            self.scroll_pos = line_idx
-        elif line_idx >= self.scroll_pos + self.height - 2:
-            self.scroll_pos = line_idx - (self.height - 3)
-            
-        # Set cursor position
-        self.cursor_y = line_idx - self.scroll_pos
-        self.cursor_x = start
+        self.goto_line(line_idx, start)
         
         self.set_status(f"Match {idx + 1}/{len(self.search_results)}")
     
@@ -379,15 +386,7 @@ class TextEditor(EditorComponent):
         try:
             line_num = int(line_num)
             if 1 <= line_num <= len(self.content):
-                # Adjust scroll position
-                if line_num - 1 < self.scroll_pos:
-                    self.scroll_pos = line_num - 1
-                elif line_num - 1 >= self.scroll_pos + self.height - 2:
-                    self.scroll_pos = line_num - 1 - (self.height - 3)
-                    
-                # Set cursor position
-                self.cursor_y = line_num - 1 - self.scroll_pos
-                self.cursor_x = 0
+                self.goto_line(line_num - 1)
                 self.set_status(f"Moved to line {line_num}")
             else:
                 self.set_status(f"Line number out of range (1-{len(self.content)})")
@@ -406,7 +405,7 @@ class TextEditor(EditorComponent):
                 self.cursor_y = len(self.content) - 1
                 
             # Set cursor to end of line
-            self.cursor_x = len(self.content[self.scroll_pos + self.cursor_y])
+            self.cursor_x = self.content.line_length(self.scroll_pos + self.cursor_y)
     
     def _goto_line_start(self):
         """Go to start of current line."""
@@ -416,7 +415,7 @@ class TextEditor(EditorComponent):
         """Go to end of current line."""
         current_line = self.scroll_pos + self.cursor_y
         if current_line < len(self.content):
-            self.cursor_x = len(self.content[current_line])
+            self.cursor_x = self.content.line_length(current_line)
     
     def _page_down(self):
         """Move down one page."""
@@ -462,24 +461,27 @@ class TextEditor(EditorComponent):
         # Show prompt
         self.stdscr.addstr(self.height - 1, 0, prompt)
         
-        # Get input
-        input_str = ""
+        # Get input as UTF-8 bytes; curses delivers multi-byte characters
+        # one byte at a time
+        buf = bytearray()
         while True:
             try:
                 ch = self.stdscr.getch()
                 if ch == 10:  # Enter
                     break
                 elif ch == 27:  # Escape
-                    input_str = ""
+                    buf.clear()
                     break
                 elif ch == curses.KEY_BACKSPACE or ch == 127:  # Backspace
-                    if input_str:
-                        input_str = input_str[:-1]
+                    if buf:
+                        # Drop the last character along with its continuation bytes
+                        while buf and buf.pop() & 0xC0 == 0x80:
+                            pass
                         self.stdscr.move(self.height - 1, len(prompt))
                         self.stdscr.clrtoeol()
-                        self.stdscr.addstr(self.height - 1, len(prompt), input_str)
-                else:
-                    input_str += chr(ch)
+                        self.stdscr.addstr(self.height - 1, len(prompt), buf.decode('utf-8', errors='replace'))
+                elif ch < 256:
+                    buf.append(ch)
             except:
                 break
                 
@@ -487,7 +489,7 @@ class TextEditor(EditorComponent):
         curses.noecho()
         curses.curs_set(0)
         
-        return input_str
+        return buf.decode('utf-8', errors='replace')
     
     def _insert_char(self, ch: int):
         """Insert character at cursor.
@@ -713,27 +715,20 @@ class TextEditor(EditorComponent):
         # Get visible content
         visible_content = self.get_visible_content()
         
-        # Apply syntax highlighting if enabled
-        highlighted_lines = {}
-        if self.syntax_highlighting and self.lexer:
-            # Join visible content for highlighting
-            content_str = "\n".join([line for _, line in visible_content])
-            
-            # Highlight content
-            highlighted = highlight(content_str, self.lexer, self.formatter)
-            
-            # Split back into lines
-            highlighted_lines = dict(enumerate(highlighted.splitlines()))
+        # Lines are highlighted one at a time, so a keystroke only
+        # highlights the lines it changed
+        highlight_lines = self.syntax_highlighting and self.lexer
         
         # Draw content
         for i, (line_idx, line) in enumerate(visible_content):
             y = i + 1  # +1 for title bar
+            segments = []
             
             # Draw line number if enabled
             if self.show_line_numbers:
                 line_num = str(line_idx + 1).rjust(line_num_width - 1)
-                self.stdscr.addstr(y, 0, line_num, self.colors["line_number"])
-                self.stdscr.addstr(y, line_num_width - 1, " ")
+                segments.append((0, line_num, self.colors["line_number"]))
+                segments.append((line_num_width - 1, " ", 0))
                 
             # Check if line is part of selection
             is_selected = False
@@ -749,10 +744,9 @@ class TextEditor(EditorComponent):
                 is_selected = start_line <= line_idx <= end_line
             
             # Draw line content
-            if self.syntax_highlighting and line_idx in highlighted_lines:
+            if highlight_lines:
                 # Draw syntax highlighted line
-                highlighted_line = highlighted_lines[line_idx]
-                self.stdscr.addstr(y, line_num_width, highlighted_line)
+                segments.append((line_num_width, _highlight_line(line, self.lexer, self.formatter), 0))
             else:
                 # Draw plain line
                 if is_selected:
@@ -763,54 +757,53 @@ class TextEditor(EditorComponent):
                         end_col = max(self.selection_start[1], self.cursor_x)
                         
                         # Draw before selection
-                        self.stdscr.addstr(y, line_num_width, line[:start_col])
+                        segments.append((line_num_width, line[:start_col], 0))
                         
                         # Draw selection
-                        self.stdscr.addstr(
-                            y, 
-                            line_num_width + start_col, 
-                            line[start_col:end_col], 
+                        segments.append((
+                            line_num_width + start_col,
+                            line[start_col:end_col],
                             self.colors["highlight"]
-                        )
+                        ))
                         
                         # Draw after selection
                         if end_col < len(line):
-                            self.stdscr.addstr(y, line_num_width + end_col, line[end_col:])
+                            segments.append((line_num_width + end_col, line[end_col:], 0))
                     elif line_idx == self.selection_start[0]:
                         # First line of multi-line selection
                         start_col = self.selection_start[1]
                         
                         # Draw before selection
-                        self.stdscr.addstr(y, line_num_width, line[:start_col])
+                        segments.append((line_num_width, line[:start_col], 0))
                         
                         # Draw selection
-                        self.stdscr.addstr(
-                            y,
+                        segments.append((
                             line_num_width + start_col,
                             line[start_col:],
                             self.colors["highlight"]
-                        )
+                        ))
                     elif line_idx == self.scroll_pos + self.cursor_y:
                         # Last line of multi-line selection
                         end_col = self.cursor_x
                         
                         # Draw selection
-                        self.stdscr.addstr(
-                            y,
+                        segments.append((
                             line_num_width,
                             line[:end_col],
                             self.colors["highlight"]
-                        )
+                        ))
                         
                         # Draw after selection
                         if end_col < len(line):
-                            self.stdscr.addstr(y, line_num_width + end_col, line[end_col:])
+                            segments.append((line_num_width + end_col, line[end_col:], 0))
                     else:
                         # Middle line of multi-line selection
-                        self.stdscr.addstr(y, line_num_width, line, self.colors["highlight"])
+                        segments.append((line_num_width, line, self.colors["highlight"]))
                 else:
                     # Draw plain line
-                    self.stdscr.addstr(y, line_num_width, line)
+                    segments.append((line_num_width, line, 0))
+                    
+            self._set_line(y, segments)
                     
     def run_editor(self) -> bool:
         """Run the editor as a standalone component.
@@ -839,7 +832,7 @@ class TextEditor(EditorComponent):
         Args:
             content: New content
         """
-        self.content = content.splitlines()
+        self.content = LineBuffer(content.splitlines())
         self.cursor_x = 0
         self.cursor_y = 0
         self.scroll_pos = 0
@@ -874,7 +867,7 @@ class TextEditor(EditorComponent):
         self.cursor_y = line - self.scroll_pos
         
         # Ensure column is valid
-        if col > len(self.content[line]):
-            col = len(self.content[line])
+        if col > self.content.line_length(line):
+            col = self.content.line_length(line)
             
         self.cursor_x = col